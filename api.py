@@ -0,0 +1,263 @@
+"""
+Read-only JSON API over the outlet sales data, for BI sheets and store displays.
+
+    python api.py --port 8502
+
+    GET /api/version                              data version and load time
+    GET /api/outlets                              outlet-wise sales, profit and margin (October MTD)
+    GET /api/categories?outlet=Hilal              category-wise totals, all outlets or one
+    GET /api/trends?outlet=Hilal&category=BAKERY  Jan-Sep monthly totals plus the current month
+
+Every response carries an ETag of the data version (the source workbooks' modification times).
+Clients that send it back in If-None-Match get 304 Not Modified until a workbook changes.
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+from datetime import datetime
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from outlet_data import (
+    OUTLET_FILES, HISTORY_FILE, CURRENT_MONTH, CURRENT_PERIOD_DAYS, CURRENT_MONTH_DAYS,
+    load_outlet_sales, prepare_outlet_sales, load_history
+)
+
+# ===============================
+# SETTINGS
+# ===============================
+API_HOST = "127.0.0.1"
+API_PORT = 8502
+VERSION_CHECK_INTERVAL = 5   # seconds between checks of the workbooks' modification times
+
+
+def data_version():
+    """Short hash of the source workbooks' modification times."""
+    files = list(OUTLET_FILES.values()) + [HISTORY_FILE]
+    mtimes = {file: os.path.getmtime(file) for file in files if os.path.exists(file)}
+    return hashlib.sha1(json.dumps(mtimes, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+def _totals(frame, keys, sales_col, profit_col):
+    """Grouped sales/profit/margin as JSON-ready records."""
+    grouped = frame.groupby(keys, observed=True)[[sales_col, profit_col]].sum().reset_index()
+    sales, profit = grouped[sales_col].to_numpy(dtype=float), grouped[profit_col].to_numpy(dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = np.where(sales > 0, profit / sales * 100, 0.0)
+    out = grouped[keys].rename(columns=str.lower)
+    out["sales"] = sales.round(2)
+    out["profit"] = profit.round(2)
+    out["margin_pct"] = margin.round(2)
+    return out
+
+
+# ===============================
+# DATASET CACHE
+# ===============================
+class Dataset:
+    """
+    One loaded version of the data plus the JSON bodies served from it. Bodies are encoded once
+    per (endpoint, filters) and reused until the version changes.
+    """
+
+    def __init__(self):
+        self.version = data_version()
+        self.loaded_at = datetime.now().isoformat(timespec="seconds")
+        raw_df, _ = load_outlet_sales()
+        self.sales = prepare_outlet_sales(raw_df) if not raw_df.empty else raw_df
+        self.history = load_history()
+        self.outlets = sorted(self.sales["Outlet"].unique().tolist()) if not self.sales.empty else []
+        self.categories = set(self.history["Category"].astype(str)) if not self.history.empty else set()
+        if not self.sales.empty:
+            self.categories.update(self.sales["Category"].astype(str))
+        self._bodies = {}
+        self._lock = threading.Lock()
+
+    def body(self, endpoint, params):
+        """Encoded JSON for an endpoint; raises KeyError for unknown endpoints, outlets or categories."""
+        cache_key = (endpoint, tuple(sorted(params.items())))
+        with self._lock:
+            if cache_key in self._bodies:
+                return self._bodies[cache_key]
+        payload = {"version": self.version, "data": ENDPOINTS[endpoint](self, **params)}
+        body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+        with self._lock:
+            self._bodies[cache_key] = body
+        return body
+
+    def check_params(self, outlet=None, category=None):
+        """Raises KeyError for an outlet or category that is not in this version of the data."""
+        if outlet and outlet not in self.outlets:
+            raise KeyError(f"Unknown outlet: {outlet}")
+        if category and category not in self.categories:
+            raise KeyError(f"Unknown category: {category}")
+
+    def _filtered(self, frame, outlet=None, category=None):
+        self.check_params(outlet, category)
+        if outlet:
+            frame = frame[frame["Outlet"] == outlet]
+        if category:
+            frame = frame[frame["Category"] == category]
+        return frame
+
+    def version_info(self):
+        return {"loaded_at": self.loaded_at, "outlets": self.outlets}
+
+    def outlet_summary(self):
+        summary = _totals(self.sales, ["Outlet"], "Total Sales", "Total Profit")
+        summary.insert(1, "items", self.sales.groupby("Outlet").size().reindex(summary["outlet"]).to_numpy())
+        return summary.sort_values("sales", ascending=False).to_dict("records")
+
+    def category_summary(self, outlet=None):
+        frame = self._filtered(self.sales, outlet)
+        return _totals(frame, ["Category"], "Total Sales", "Total Profit") \
+            .sort_values("sales", ascending=False).to_dict("records")
+
+    def monthly_trend(self, outlet=None, category=None):
+        history = self._filtered(self.history, outlet, category)
+        months = _totals(history, ["Month"], "Sales", "Profit")
+        months["month"] = months["month"].astype(str)
+        months["partial"] = False
+        records = months.to_dict("records")
+
+        current = self._filtered(self.sales, outlet, category)
+        if not current.empty:
+            sales, profit = current["Total Sales"].sum(), current["Total Profit"].sum()
+            run_rate = CURRENT_MONTH_DAYS / CURRENT_PERIOD_DAYS
+            records.append({
+                "month": CURRENT_MONTH, "sales": round(sales, 2), "profit": round(profit, 2),
+                "margin_pct": round(profit / sales * 100, 2) if sales > 0 else 0.0, "partial": True,
+                "days": CURRENT_PERIOD_DAYS, "projected_sales": round(sales * run_rate, 2),
+                "projected_profit": round(profit * run_rate, 2),
+            })
+        return records
+
+
+ENDPOINTS = {
+    "/api/version": Dataset.version_info,
+    "/api/outlets": Dataset.outlet_summary,
+    "/api/categories": Dataset.category_summary,
+    "/api/trends": Dataset.monthly_trend,
+}
+ENDPOINT_PARAMS = {
+    "/api/version": (),
+    "/api/outlets": (),
+    "/api/categories": ("outlet",),
+    "/api/trends": ("outlet", "category"),
+}
+
+
+class DatasetCache:
+    """
+    Holds the current Dataset. Workbook mtimes are checked at most every VERSION_CHECK_INTERVAL
+    seconds; a new version is loaded on a background thread while requests keep getting the
+    previous one, so polling clients never wait on a reload.
+    """
+
+    def __init__(self, check_interval=VERSION_CHECK_INTERVAL):
+        self.dataset = Dataset()
+        self._check_interval = check_interval
+        self._checked_at = time.monotonic()
+        self._reloading = threading.Lock()
+
+    def current(self):
+        now = time.monotonic()
+        if now - self._checked_at >= self._check_interval:
+            self._checked_at = now
+            if data_version() != self.dataset.version and self._reloading.acquire(blocking=False):
+                threading.Thread(target=self._reload, name="api-reload", daemon=True).start()
+        return self.dataset
+
+    def _reload(self):
+        try:
+            self.dataset = Dataset()
+        finally:
+            self._reloading.release()
+
+
+# ===============================
+# HTTP
+# ===============================
+class ApiHandler(BaseHTTPRequestHandler):
+    cache = None   # set by serve()
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = url.path.rstrip("/")
+        if endpoint not in ENDPOINTS:
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": f"Unknown endpoint: {url.path}",
+                                                          "endpoints": list(ENDPOINTS)})
+        query = parse_qs(url.query)
+        params = {name: query[name][0] for name in ENDPOINT_PARAMS[endpoint] if query.get(name, [""])[0]}
+
+        dataset = self.cache.current()
+        try:
+            # Before the ETag check: an unknown outlet is a 404, never a 304
+            dataset.check_params(**params)
+        except KeyError as e:
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": e.args[0]})
+        etag = f'"{dataset.version}"'
+        if etag in self._if_none_match(dataset):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            return
+
+        try:
+            body = dataset.body(endpoint, params)
+        except KeyError as e:
+            return self._send_json(HTTPStatus.NOT_FOUND, {"error": e.args[0]})
+        self._send(HTTPStatus.OK, body, etag)
+
+    def _if_none_match(self, dataset):
+        header = self.headers.get("If-None-Match", "")
+        tags = {tag.strip().removeprefix("W/") for tag in header.split(",") if tag.strip()}
+        if "*" in tags:
+            tags.add(f'"{dataset.version}"')
+        return tags
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload).encode("utf-8"))
+
+    def _send(self, status, body, etag=None):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-cache")
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(host=API_HOST, port=API_PORT):
+    ApiHandler.cache = DatasetCache()
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="JSON API over the outlet sales data")
+    parser.add_argument("--host", default=API_HOST, help="interface to bind (default: localhost only)")
+    parser.add_argument("--port", type=int, default=API_PORT)
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    server = serve(args.host, args.port)
+    print(f"Data version {ApiHandler.cache.dataset.version} loaded in {time.perf_counter() - started:.1f}s")
+    print(f"Serving on http://{args.host}:{args.port}/api/outlets (Ctrl+C to stop)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
@@ -0,0 +1,96 @@
+import os
+
+import pandas as pd
+
+# ===============================
+# SETTINGS
+# ===============================
+# Optional CSV with Department,Category columns. Categories missing from it go under UNASSIGNED.
+# A Sub-Category level is added when the sales data itself has a Sub-Category column.
+HIERARCHY_FILE = "category_hierarchy.csv"
+UNASSIGNED = "Other"
+TOTAL = "All"
+
+
+def load_hierarchy(file=HIERARCHY_FILE):
+    """Department -> Category mapping, or None when the file is absent."""
+    if not os.path.exists(file):
+        return None
+    hierarchy = pd.read_csv(file, dtype=str).fillna("")
+    hierarchy.columns = hierarchy.columns.str.strip()
+    for col in hierarchy.columns:
+        hierarchy[col] = hierarchy[col].str.strip()
+    return hierarchy
+
+
+# ===============================
+# ROLL-UPS
+# ===============================
+class CategoryRollup:
+    """
+    Sales and profit subtotals at every hierarchy level for every (outlet, month), including
+    "All" outlets and "All" months, stored in a dict so any drill-down or roll-up is a lookup.
+    Built once per load from the long frame (outlet, Month, Category[, Sub-Category], Sales, Profit).
+    """
+
+    def __init__(self, frame, hierarchy=None, outlet_col="outlet", month_col="Month"):
+        frame = frame.assign(Category=frame["Category"].astype(str))
+        categories = frame[["Category"]].drop_duplicates()
+
+        if hierarchy is not None:
+            departments = hierarchy[["Category", "Department"]].drop_duplicates("Category")
+            categories = categories.merge(departments, on="Category", how="left")
+            categories["Department"] = categories["Department"].replace("", pd.NA).fillna(UNASSIGNED)
+            frame = frame.merge(categories, on="Category", how="left")
+
+        self.levels = ["Total"] + (["Department"] if hierarchy is not None else []) + ["Category"]
+        if "Sub-Category" in frame.columns:
+            frame["Sub-Category"] = frame["Sub-Category"].fillna("").astype(str).str.strip().replace("", UNASSIGNED)
+            self.levels.append("Sub-Category")
+        frame = frame.assign(Total=TOTAL)
+
+        # Outlet and month roll-ups, then one groupby per level
+        stacked = pd.concat([
+            frame,
+            frame.assign(**{outlet_col: TOTAL}),
+            frame.assign(**{month_col: TOTAL}),
+            frame.assign(**{outlet_col: TOTAL, month_col: TOTAL}),
+        ], ignore_index=True)
+        stacked[month_col] = stacked[month_col].astype(str)
+
+        self.subtotals = {}
+        for level in self.levels:
+            grouped = stacked.groupby([outlet_col, month_col, level], sort=False)[["Sales", "Profit"]].sum()
+            for (outlet, month, node), sales, profit in zip(grouped.index, grouped["Sales"], grouped["Profit"]):
+                self.subtotals[(outlet, month, level, node)] = (sales, profit)
+
+        # Parent node -> child nodes, for the next level down
+        self.child_nodes = {}
+        for parent, child in zip(self.levels, self.levels[1:]):
+            pairs = frame[[parent, child]].drop_duplicates().sort_values(child)
+            for node, rows in pairs.groupby(parent, sort=False):
+                self.child_nodes[(parent, node)] = rows[child].tolist()
+
+    def children(self, level, node):
+        return self.child_nodes.get((level, node), [])
+
+    def total(self, outlet=TOTAL, month=TOTAL, level="Total", node=TOTAL):
+        """(sales, profit) of one node; (0, 0) when it has no rows for that outlet and month."""
+        return self.subtotals.get((outlet, month, level, node), (0.0, 0.0))
+
+    def child_level(self, level):
+        i = self.levels.index(level)
+        return self.levels[i + 1] if i + 1 < len(self.levels) else None
+
+    def breakdown(self, outlet=TOTAL, month=TOTAL, level="Total", node=TOTAL):
+        """One row per child of the node with its Sales and Profit; returns (child level, frame)."""
+        child_level = self.child_level(level)
+        children = self.children(level, node) if child_level else []
+        rows = [(child, *self.total(outlet, month, child_level, child)) for child in children]
+        frame = pd.DataFrame(rows, columns=[child_level or level, "Sales", "Profit"])
+        return child_level, frame[(frame["Sales"] != 0) | (frame["Profit"] != 0)].reset_index(drop=True)
+
+    def monthly(self, months, outlet=TOTAL, level="Total", node=TOTAL):
+        """Sales and Profit of one node for each month, indexed by month."""
+        values = [self.total(outlet, month, level, node) for month in months]
+        return pd.DataFrame(values, index=pd.Index(months, name="Month"), columns=["Sales", "Profit"])
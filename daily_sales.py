@@ -0,0 +1,275 @@
+import argparse
+import calendar
+import json
+import os
+import shutil
+import time
+from datetime import date
+
+import pandas as pd
+import plotly.graph_objects as go
+import streamlit as st
+
+from outlet_data import DATA_DIR, OUTLET_FILES, validate_outlet_sales
+
+# ===============================
+# STORE LAYOUT
+# ===============================
+# data_store/daily_sales/
+#   drops/date=<YYYY-MM-DD>/outlet=<name>/data.parquet   validated item rows of each daily drop
+#   daily_totals.parquet   one row per (date, outlet, category), what the dashboards read
+#   rolling.parquet        7/30-day sums per (outlet, category) as of the latest ingested date
+#   state.json             the as-of date
+DAILY_DIR = os.path.join(DATA_DIR, "daily_sales")
+DROPS_DIR = os.path.join(DAILY_DIR, "drops")
+TOTALS_FILE = os.path.join(DAILY_DIR, "daily_totals.parquet")
+ROLLING_FILE = os.path.join(DAILY_DIR, "rolling.parquet")
+STATE_FILE = os.path.join(DAILY_DIR, "state.json")
+
+ROLLING_WINDOWS = (7, 30)
+VALUE_COLS = ["Sales", "Profit"]
+KEY_COLS = ["Outlet", "Category"]
+
+
+def _window_cols(window):
+    return [f"{col} {window}d" for col in VALUE_COLS]
+
+
+ROLLING_COLS = [col for window in ROLLING_WINDOWS for col in _window_cols(window)]
+
+
+# ===============================
+# DAILY SALES STORE
+# ===============================
+class DailySalesStore:
+    """
+    Daily outlet sales drops reduced to per-(outlet, category, date) totals.
+    Rolling 7/30-day sums are kept as of the latest ingested date and updated by adding the new
+    day and subtracting the day that leaves each window, never by re-summing the history.
+    """
+
+    def __init__(self):
+        index = pd.MultiIndex.from_arrays([pd.DatetimeIndex([]), [], []], names=["Date"] + KEY_COLS)
+        self.totals = pd.DataFrame({col: pd.Series(dtype=float) for col in VALUE_COLS}, index=index)
+        self.rolling = pd.DataFrame(
+            {col: pd.Series(dtype=float) for col in ROLLING_COLS},
+            index=pd.MultiIndex.from_arrays([[], []], names=KEY_COLS),
+        )
+        self.as_of = None
+
+    @classmethod
+    def load(cls):
+        store = cls()
+        if os.path.exists(STATE_FILE):
+            with open(STATE_FILE) as f:
+                store.as_of = pd.Timestamp(json.load(f)["as_of"])
+            store.totals = pd.read_parquet(TOTALS_FILE).sort_index()
+            store.rolling = pd.read_parquet(ROLLING_FILE)
+        return store
+
+    def _day(self, day, outlet=None):
+        """Totals of one date indexed by (Outlet, Category), optionally for one outlet."""
+        try:
+            frame = self.totals.xs(day, level="Date")
+        except KeyError:
+            return self.totals.iloc[0:0].droplevel("Date")
+        if outlet is not None:
+            frame = frame[frame.index.get_level_values("Outlet") == outlet]
+        return frame
+
+    def _add_to_window(self, window, values, sign=1):
+        values = values[VALUE_COLS].set_axis(_window_cols(window), axis=1) * sign
+        self.rolling = self.rolling.add(values, fill_value=0).reindex(columns=ROLLING_COLS, fill_value=0)
+
+    def _advance(self, day):
+        """Moves the rolling windows forward to end on `day`."""
+        if (day - self.as_of).days >= max(ROLLING_WINDOWS):
+            # Every day in the windows has left: nothing to carry over
+            self.rolling = self.rolling.iloc[0:0]
+        else:
+            for offset in range(1, (day - self.as_of).days + 1):
+                current = self.as_of + pd.Timedelta(days=offset)
+                for window in ROLLING_WINDOWS:
+                    leaving = self._day(current - pd.Timedelta(days=window))
+                    if not leaving.empty:
+                        self._add_to_window(window, leaving, sign=-1)
+        self.as_of = day
+
+    def ingest(self, df, outlet, day):
+        """
+        Adds one outlet's sales for one date (workbook rows: Item Code, Items, Category,
+        Total Sales, Total Profit). Ingesting the same outlet and date again replaces it.
+        Returns (summary dict, issues frame).
+        """
+        day = pd.Timestamp(day).normalize()
+        clean, issues, _ = validate_outlet_sales(df.assign(Outlet=outlet))
+
+        folder = os.path.join(DROPS_DIR, f"date={day.date().isoformat()}", f"outlet={outlet}")
+        shutil.rmtree(folder, ignore_errors=True)
+        os.makedirs(folder)
+        clean.drop(columns="Outlet").astype({"Item Code": str}).to_parquet(os.path.join(folder, "data.parquet"))
+
+        new = (
+            clean.groupby(["Outlet", "Category"])[["Total Sales", "Total Profit"]].sum()
+            .set_axis(VALUE_COLS, axis=1)
+        )
+        old = self._day(day, outlet)
+        delta = new.sub(old, fill_value=0)
+
+        keep = ~((self.totals.index.get_level_values("Date") == day)
+                 & (self.totals.index.get_level_values("Outlet") == outlet))
+        new_rows = pd.concat({day: new}, names=["Date"])
+        self.totals = pd.concat([self.totals[keep], new_rows]).sort_index()
+
+        if self.as_of is None:
+            self.as_of = day
+        elif day > self.as_of:
+            self._advance(day)
+        for window in ROLLING_WINDOWS:
+            # The changed day only counts if it falls inside the window ending on as_of
+            if (self.as_of - day).days < window:
+                self._add_to_window(window, delta)
+
+        self._save()
+        summary = {"date": day.date(), "outlet": outlet, "rows": len(clean),
+                   "excluded": int(issues["Excluded"].sum()) if not issues.empty else 0,
+                   "sales": float(new["Sales"].sum()), "as_of": self.as_of.date()}
+        return summary, issues
+
+    def _save(self):
+        os.makedirs(DAILY_DIR, exist_ok=True)
+        self.totals.to_parquet(TOTALS_FILE)
+        self.rolling.to_parquet(ROLLING_FILE)
+        with open(STATE_FILE, "w") as f:
+            json.dump({"as_of": self.as_of.date().isoformat()}, f)
+
+    # ===============================
+    # DASHBOARD QUERIES
+    # ===============================
+    @staticmethod
+    def _select(frame, outlets=None, categories=None, exclude_categories=None):
+        mask = pd.Series(True, index=frame.index)
+        if outlets:
+            mask &= frame.index.get_level_values("Outlet").isin(outlets)
+        if categories:
+            mask &= frame.index.get_level_values("Category").isin(categories)
+        if exclude_categories:
+            mask &= ~frame.index.get_level_values("Category").isin(exclude_categories)
+        return frame[mask.to_numpy()]
+
+    def daily_trend(self, outlets=None, categories=None, exclude_categories=None, days=90):
+        """Sales and Profit per day over the last `days` days, with a 7-day moving average."""
+        if self.as_of is None:
+            return pd.DataFrame(columns=VALUE_COLS + ["Sales 7d Avg"])
+        start = self.as_of - pd.Timedelta(days=days - 1)
+        recent = self.totals.loc[start:self.as_of]
+        daily = (
+            self._select(recent, outlets, categories, exclude_categories)
+            .groupby(level="Date")[VALUE_COLS].sum()
+            .reindex(pd.date_range(start, self.as_of, freq="D", name="Date"))
+        )
+        daily = daily.loc[daily.first_valid_index():] if daily.notna().any().any() else daily.iloc[0:0]
+        daily["Sales 7d Avg"] = daily["Sales"].fillna(0).rolling(7, min_periods=1).mean()
+        return daily
+
+    def mtd_projection(self, outlets=None, categories=None, exclude_categories=None):
+        """
+        Month-to-date totals of the as-of month and the month-end projection from the rolling
+        7-day run rate. Returns (cumulative daily frame, metrics dict), or (None, None) if empty.
+        """
+        if self.as_of is None or self.totals.empty:
+            return None, None
+        month_start = self.as_of.replace(day=1)
+        month_days = calendar.monthrange(self.as_of.year, self.as_of.month)[1]
+        elapsed = self.as_of.day
+
+        month = self._select(self.totals.loc[month_start:self.as_of], outlets, categories, exclude_categories)
+        daily = (
+            month.groupby(level="Date")[VALUE_COLS].sum()
+            .reindex(pd.date_range(month_start, self.as_of, freq="D", name="Date"), fill_value=0)
+        )
+        rolling = self._select(self.rolling, outlets, categories, exclude_categories)[ROLLING_COLS].sum()
+
+        mtd_sales, mtd_profit = daily["Sales"].sum(), daily["Profit"].sum()
+        # Daily run rate over the last 7 days, or over fewer if the store is younger than that
+        covered_days = min(7, (self.as_of - self.totals.index[0][0]).days + 1)
+        run_rate = rolling["Sales 7d"] / covered_days
+        metrics = {
+            "as_of": self.as_of.date(), "month_days": month_days, "elapsed_days": elapsed,
+            "mtd_sales": mtd_sales, "mtd_profit": mtd_profit,
+            "sales_7d": rolling["Sales 7d"], "sales_30d": rolling["Sales 30d"],
+            "profit_30d": rolling["Profit 30d"],
+            "run_rate": run_rate,
+            "projected_sales": mtd_sales + run_rate * (month_days - elapsed),
+            "projected_sales_mtd_pace": mtd_sales / elapsed * month_days,
+        }
+        return daily.cumsum(), metrics
+
+
+def daily_sales_version():
+    """Changes whenever a drop is ingested; used as the dashboards' cache key."""
+    return os.path.getmtime(STATE_FILE) if os.path.exists(STATE_FILE) else None
+
+
+@st.cache_resource(max_entries=1)
+def load_daily_sales(version):
+    # Shared by the dashboards; reloaded only when a new daily drop changes the store version
+    return DailySalesStore.load()
+
+
+# ===============================
+# STREAMLIT HELPER
+# ===============================
+def show_daily_sales(store, outlets=None, categories=None, exclude_categories=None, key="daily"):
+    """Daily trend and month-to-date projection charts for the selected outlets/categories."""
+    if store.as_of is None or store.totals.empty:
+        st.info("No daily sales drops ingested yet. Run `python daily_sales.py <file> --outlet <name> --date <YYYY-MM-DD>`.")
+        return
+
+    cumulative, metrics = store.mtd_projection(outlets, categories, exclude_categories)
+    m1, m2, m3, m4 = st.columns(4)
+    m1.metric(f"📅 MTD Sales ({metrics['elapsed_days']} of {metrics['month_days']} days)", f"{metrics['mtd_sales']:,.2f}")
+    m2.metric("🏃 7-Day Run Rate / Day", f"{metrics['run_rate']:,.2f}")
+    m3.metric("🔮 Projected Month Sales", f"{metrics['projected_sales']:,.2f}",
+              f"{metrics['projected_sales'] - metrics['projected_sales_mtd_pace']:+,.0f} vs MTD pace")
+    margin_30d = metrics["profit_30d"] / metrics["sales_30d"] * 100 if metrics["sales_30d"] > 0 else 0
+    m4.metric("⚙️ 30-Day Margin %", f"{margin_30d:.2f}%")
+
+    trend = store.daily_trend(outlets, categories, exclude_categories)
+    col_trend, col_mtd = st.columns(2)
+    with col_trend:
+        fig = go.Figure()
+        fig.add_trace(go.Bar(x=trend.index, y=trend["Sales"], name="Daily Sales", marker_color="royalblue"))
+        fig.add_trace(go.Scatter(x=trend.index, y=trend["Sales 7d Avg"], name="7-Day Avg",
+                                 mode="lines", line=dict(color="orange", width=3)))
+        fig.update_layout(title="Daily Sales", height=400, template="plotly_white", title_x=0.5,
+                          xaxis_title="Date", yaxis_title="Sales", legend=dict(orientation="h"))
+        st.plotly_chart(fig, use_container_width=True, key=f"{key}_trend")
+    with col_mtd:
+        month_end = cumulative.index[0] + pd.Timedelta(days=metrics["month_days"] - 1)
+        fig_mtd = go.Figure()
+        fig_mtd.add_trace(go.Scatter(x=cumulative.index, y=cumulative["Sales"], name="MTD Sales",
+                                     mode="lines+markers", line=dict(color="royalblue", width=3)))
+        fig_mtd.add_trace(go.Scatter(x=[cumulative.index[-1], month_end],
+                                     y=[metrics["mtd_sales"], metrics["projected_sales"]],
+                                     name="Projection (7-day run rate)", mode="lines",
+                                     line=dict(color="green", width=3, dash="dash")))
+        fig_mtd.update_layout(title=f"Month-to-Date Sales & Projection ({metrics['as_of']:%b-%Y})", height=400,
+                              template="plotly_white", title_x=0.5, xaxis_title="Date", yaxis_title="Sales",
+                              legend=dict(orientation="h"))
+        st.plotly_chart(fig_mtd, use_container_width=True, key=f"{key}_mtd")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest daily outlet sales drops")
+    parser.add_argument("file", help="daily sales workbook, same columns as the outlet workbooks")
+    parser.add_argument("--outlet", required=True, choices=list(OUTLET_FILES), help="outlet the drop belongs to")
+    parser.add_argument("--date", default=date.today().isoformat(), help="sales date (YYYY-MM-DD)")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    store = DailySalesStore.load()
+    summary, issues = store.ingest(pd.read_excel(args.file), args.outlet, args.date)
+    print(f"{args.file}: {summary['rows']:,} rows ({summary['excluded']} excluded), "
+          f"sales {summary['sales']:,.2f} for {summary['outlet']} on {summary['date']} "
+          f"in {time.perf_counter() - started:.2f}s; rolling windows as of {summary['as_of']}")
@@ -1,7 +1,14 @@
 import streamlit as st
 import pandas as pd
+import uuid
 from datetime import datetime
 
+from expiry_alerts import ExpiryIndex
+from export import download_buttons
+from item_master import ITEM_MASTER_FILE, ItemMaster
+from query_engine import append_submissions
+from session_store import get_session_store
+
 # ==========================================
 # PAGE CONFIG
 # ==========================================
@@ -99,8 +106,12 @@ def inject_numeric_keyboard_script(target_label):
         }}
         // Run on load and whenever Streamlit rerenders the component (e.g., after a form submit)
         window.onload = setInputMode;
-        // Also observe for changes in the DOM (needed for dynamic Streamlit content)
-        new MutationObserver(setInputMode).observe(document.body, {{ childList: true, subtree: true }});
+        // Also observe for changes in the DOM (needed for dynamic Streamlit content).
+        // Attach the observer only once, however many times the page is redrawn.
+        if (!window.numericKeyboardObserver) {{
+            window.numericKeyboardObserver = new MutationObserver(setInputMode);
+            window.numericKeyboardObserver.observe(document.body, {{ childList: true, subtree: true }});
+        }}
     </script>
     """
     st.markdown(script, unsafe_allow_html=True)
@@ -108,27 +119,32 @@ def inject_numeric_keyboard_script(target_label):
 # ==========================================
 # LOAD ITEM DATA (for auto-fill)
 # ==========================================
-@st.cache_data
-def load_item_data():
-    # NOTE: The actual file "alllist.xlsx" must be present in the directory 
-    file_path = "alllist.xlsx" 
-    try:
-        df = pd.read_excel(file_path)
-        # Ensure column names are clean
-        df.columns = df.columns.str.strip()
-        
-        # Check only critical columns needed for the app to run
-        required_cols = ["Item Bar Code", "Item Name", "LP Supplier"] 
-        for col in required_cols:
-            if col not in df.columns:
-                st.error(f"⚠️ Missing critical column: '{col}' in alllist.xlsx. Please check the file.")
-                return pd.DataFrame()
-        return df
-    except FileNotFoundError:
-        st.error(f"⚠️ Data file not found: {file_path}. Please ensure the file is in the application directory.")
-        return pd.DataFrame()
-
-item_data = load_item_data()
+@st.cache_resource
+def get_item_master():
+    # Shared by all sessions: starts from the stored version, ingests alllist.xlsx if it is newer,
+    # then a background thread applies only the changed barcodes when a new export is dropped in
+    master = ItemMaster.load()
+    master.refresh()
+    master.start_watcher()
+    return master
+
+try:
+    item_master = get_item_master()
+except ValueError as e:
+    st.error(f"⚠️ {e}. Please check the file.")
+    item_master = ItemMaster()
+else:
+    if not len(item_master):
+        st.error(f"⚠️ Data file not found: {ITEM_MASTER_FILE}. Please ensure the file is in the application directory.")
+
+# ==========================================
+# EXPIRY INDEX (shared by all sessions)
+# ==========================================
+@st.cache_resource
+def get_expiry_index():
+    # Built once per server from the submissions store. The daily pull lists are written by a
+    # single `python expiry_alerts.py` process, not by each app replica.
+    return ExpiryIndex.from_submissions()
 
 # ==========================================
 # LOGIN SYSTEM
@@ -161,15 +177,73 @@ for key in ["logged_in", "selected_outlet", "submitted_items",
         else:
             st.session_state[key] = ""
 
+# ------------------------------------------------------------------
+# --- Draft persistence (survives restarts, shared across processes) ---
+@st.cache_resource
+def get_draft_store():
+    return get_session_store()
+
+def device_id():
+    """
+    Id of this tablet/browser, kept in the page URL (?device=...) so a reload or a server restart
+    finds the same draft. Each device gets its own draft, so two tablets on one outlet never
+    overwrite each other's lists.
+    """
+    if "device_id" not in st.session_state:
+        if "device" not in st.query_params:
+            st.query_params["device"] = uuid.uuid4().hex[:12]
+        st.session_state.device_id = st.query_params["device"]
+    return st.session_state.device_id
+
+def draft_key():
+    return f"draft:{st.session_state.selected_outlet}:{device_id()}"
+
+def restore_draft():
+    """Loads this device's saved in-progress list and lookup state for the outlet into this session."""
+    saved = get_draft_store().load(draft_key())
+    if saved:
+        for key, value in saved.items():
+            st.session_state[key] = value
+        st.session_state.draft_saved = True
+
+def save_draft():
+    """
+    Queues the current in-progress state; the store writes it behind in the background.
+    Called from the callbacks that change the list or lookup, so each interaction encodes the
+    state once, whichever fragment or full run follows it.
+    With no items or lookup in progress the device's draft is deleted, so idle devices keep no row.
+    """
+    if st.session_state.submitted_items or st.session_state.barcode_value.strip():
+        get_draft_store().save(draft_key(), st.session_state)
+        st.session_state.draft_saved = True
+    elif st.session_state.get("draft_saved"):
+        get_draft_store().delete(draft_key())
+        st.session_state.draft_saved = False
+# ------------------------------------------------------------------
+
 # ------------------------------------------------------------------
 # --- Helper functions to synchronize manual inputs ---
 def update_item_name_state():
     """Updates the main item_name_input state variable from the temp manual input."""
     st.session_state.item_name_input = st.session_state.temp_item_name_manual
+    save_draft()
 
 def update_supplier_state():
     """Updates the main supplier_input state variable from the temp manual input."""
     st.session_state.supplier_input = st.session_state.temp_supplier_manual
+    save_draft()
+# ------------------------------------------------------------------
+
+# ------------------------------------------------------------------
+# --- Toasts from callbacks ---
+# Callbacks run before a fragment rerun, where drawing elements is not supported,
+# so they queue their messages and the fragment shows them when it redraws.
+def queue_toast(message, icon=None):
+    st.session_state.setdefault("pending_toasts", []).append((message, icon))
+
+def show_pending_toasts():
+    for message, icon in st.session_state.pop("pending_toasts", []):
+        st.toast(message, icon=icon)
 # ------------------------------------------------------------------
 
 # ------------------------------------------------------------------
@@ -191,30 +265,30 @@ def lookup_item_and_update_state():
     st.session_state.temp_supplier_manual = "" 
     
     if not barcode:
-        st.toast("⚠️ Barcode cleared.", icon="❌")
+        save_draft()
+        queue_toast("⚠️ Barcode cleared.", icon="❌")
         return
 
-    if not item_data.empty:
-        match = item_data[item_data["Item Bar Code"].astype(str).str.strip() == str(barcode).strip()]
+    if len(item_master):
+        row = item_master.lookup(barcode)
         
-        if not match.empty:
+        if row is not None:
             st.session_state.barcode_found = True
-            row = match.iloc[0]
             
             # 1. Prepare data for display table
-            df_display = row[["Item Name", "LP Supplier"]].to_frame().T
-            df_display.columns = ["Item Name", "Supplier"]
-            st.session_state.lookup_data = df_display.reset_index(drop=True)
+            df_display = pd.DataFrame([{"Item Name": row["Item Name"], "Supplier": row["LP Supplier"]}])
+            st.session_state.lookup_data = df_display
             
             # 2. Automatically transfer details to the main state variables
             st.session_state.item_name_input = str(row["Item Name"])
             st.session_state.supplier_input = str(row["LP Supplier"])
             
-            st.toast("✅ Item found. Details loaded.", icon="🔍")
+            queue_toast("✅ Item found. Details loaded.", icon="🔍")
         else:
             # Barcode not found 
             st.session_state.barcode_found = False 
-            st.toast("⚠️ Barcode not found. Please enter item name and supplier manually.", icon="⚠️")
+            queue_toast("⚠️ Barcode not found. Please enter item name and supplier manually.", icon="⚠️")
+    save_draft()
     
 # ------------------------------------------------------------------
 
@@ -225,13 +299,13 @@ def process_item_entry(barcode, item_name, qty, cost, selling, expiry, supplier,
     
     # Validation
     if not barcode.strip():
-        st.toast("⚠️ Barcode is required before adding.", icon="❌")
+        queue_toast("⚠️ Barcode is required before adding.", icon="❌")
         return False
     if not item_name.strip():
-        st.toast("⚠️ Item Name is required before adding.", icon="❌")
+        queue_toast("⚠️ Item Name is required before adding.", icon="❌")
         return False
     if not staff_name.strip():
-        st.toast("⚠️ Staff Name is required before adding.", icon="❌")
+        queue_toast("⚠️ Staff Name is required before adding.", icon="❌")
         return False
 
     try:
@@ -267,11 +341,195 @@ def process_item_entry(barcode, item_name, qty, cost, selling, expiry, supplier,
     st.session_state.lookup_data = pd.DataFrame() 
     st.session_state.barcode_found = False
     
-    st.toast("✅ Added to list successfully! The form has been cleared.", icon="➕")
+    queue_toast("✅ Added to list successfully! The form has been cleared.", icon="➕")
     return True
+
+def add_item_from_form(outlet_name, form_type):
+    """Callback for the item entry form: reads the submitted form values and adds the item."""
+    process_item_entry(
+        st.session_state.barcode_value,
+        st.session_state.item_name_input,
+        st.session_state.entry_qty,
+        st.session_state.entry_cost,
+        st.session_state.entry_selling,
+        st.session_state.entry_expiry if form_type != "Damages" else None,
+        st.session_state.supplier_input,
+        st.session_state.entry_remarks,
+        form_type,
+        outlet_name,
+        st.session_state.staff_name
+    )
+    save_draft()
+
+def delete_item(index):
+    """Callback for the delete button in the item list."""
+    st.session_state.submitted_items.pop(index)
+    save_draft()
+    queue_toast("✅ Item removed", icon="🗑️")
 # -------------------------------------------------
 
 
+# ==========================================
+# FRAGMENTS (OUTLET DASHBOARD)
+# ==========================================
+# A barcode scan reruns only lookup_fragment; adding an item reruns item_entry_fragment
+# (which redraws the nested lookup and list); deleting reruns only items_list_fragment.
+# The CSS, keyboard script, header and sidebar are only drawn on full reruns. They are still sent
+# on every full rerun: Streamlit removes any element a full run does not draw again.
+@st.fragment
+def lookup_fragment():
+    show_pending_toasts()
+
+    # --- 1. Dedicated Lookup Form (Enter key only triggers search/filter) ---
+    with st.form("barcode_lookup_form", clear_on_submit=False):
+        
+        col_bar, col_btn = st.columns([5, 1])
+        
+        with col_bar:
+            # Barcode Lookup remains st.text_input, but JS will set inputmode='numeric'
+            st.text_input(
+                "Barcode Lookup",
+                key="lookup_barcode_input", 
+                placeholder="Enter or scan barcode and press Enter to search details",
+                value=st.session_state.barcode_value
+            )
+        
+        with col_btn:
+            st.markdown("<div style='height: 33px;'></div>", unsafe_allow_html=True) # Spacer
+            st.form_submit_button(
+                "🔍 Search", 
+                on_click=lookup_item_and_update_state, 
+                help="Click or press Enter in the barcode field to look up item.",
+                type="secondary",
+                use_container_width=True
+            )
+
+    # --- 2. Item Details Display Panel (The 'Filter' result) ---
+    if not st.session_state.lookup_data.empty:
+        st.markdown("### 🔍 Found Item Details")
+        st.dataframe(st.session_state.lookup_data, use_container_width=True, hide_index=True)
+    
+    # --- 2b. Manual Entry Fallback ---
+    # Show manual entry fields ONLY if a search was done and the barcode was NOT found
+    if st.session_state.barcode_value.strip() and not st.session_state.barcode_found:
+         st.markdown("### ⚠️ Manual Item Entry (Barcode Not Found)")
+         col_manual_name, col_manual_supplier = st.columns(2)
+         with col_manual_name:
+             st.text_input(
+                 "Item Name (Manual)", 
+                 value=st.session_state.item_name_input, 
+                 key="temp_item_name_manual", 
+                 on_change=update_item_name_state
+             )
+         with col_manual_supplier:
+             st.text_input(
+                 "Supplier Name (Manual)", 
+                 value=st.session_state.supplier_input, 
+                 key="temp_supplier_manual", 
+                 on_change=update_supplier_state
+             )
+
+    # Separator only if a search has happened
+    if st.session_state.barcode_value.strip():
+         st.markdown("---")
+
+
+@st.fragment
+def items_list_fragment(outlet_name, form_type):
+    show_pending_toasts()
+
+    # Displaying and managing the list
+    if st.session_state.submitted_items:
+        st.markdown("### 🧾 Items Added")
+        df = pd.DataFrame(st.session_state.submitted_items)
+        st.dataframe(df, use_container_width=True, hide_index=True)
+        download_buttons(df, f"{outlet_name}_{form_type}_list".replace(" ", "_"), key="items_added_export",
+                         sales_col="Amount", profit_col=None)
+
+        col_submit, col_delete = st.columns([1, 1])
+        with col_submit:
+            if st.button("📤 Submit All", type="primary"):
+                # Keep the submitted list in the parquet store (queryable from sqlquery.py).
+                # Build the index first, so a first-time build does not read the new rows and then add them again.
+                expiry_index = get_expiry_index()
+                stored = append_submissions(st.session_state.submitted_items)
+                expiry_index.add_records(stored)
+                get_draft_store().delete(draft_key())
+                st.session_state.draft_saved = False
+                st.success(f"✅ All {len(st.session_state.submitted_items)} items submitted for {outlet_name}. Resetting.")
+                
+                # FINAL RESET OF ITEM LOOKUP DATA AND STAFF NAME
+                st.session_state.submitted_items = []
+                st.session_state.barcode_value = ""
+                st.session_state.item_name_input = ""
+                st.session_state.supplier_input = ""
+                st.session_state.barcode_found = False
+                st.session_state.temp_item_name_manual = "" 
+                st.session_state.temp_supplier_manual = "" 
+                st.session_state.lookup_data = pd.DataFrame() 
+                st.session_state.staff_name = "" 
+                # Full rerun: the staff name field lives outside the fragments
+                st.rerun() 
+
+        with col_delete:
+            options = [f"{i+1}. {item['Item Name']} ({item['Qty']} pcs)" for i, item in enumerate(st.session_state.submitted_items)]
+            if options:
+                to_delete = st.selectbox("Select Item to Delete", ["Select item to remove..."] + options)
+                if to_delete != "Select item to remove...":
+                    st.button("❌ Delete Selected", type="secondary",
+                              on_click=delete_item, args=(options.index(to_delete),))
+
+
+@st.fragment
+def item_entry_fragment(outlet_name, form_type):
+    show_pending_toasts()
+
+    # --- 1-2. Barcode lookup, found details and manual entry ---
+    lookup_fragment()
+
+    # --- 3. Start of the Main Item Entry Form ---
+    with st.form("item_entry_form", clear_on_submit=True): 
+        
+        # --- Row 1: Qty and Expiry ---
+        col1, col2 = st.columns(2)
+        with col1:
+            st.number_input("Qty [PCS]", min_value=1, value=1, step=1, key="entry_qty")
+        with col2:
+            if form_type != "Damages":
+                st.date_input("Expiry Date", datetime.now().date(), key="entry_expiry")
+
+        # --- Row 2: Cost, Selling (Already st.number_input) ---
+        col5, col6 = st.columns(2)
+        with col5:
+            # This uses number keyboard by default on mobile
+            cost = st.number_input("Cost", min_value=0.0, value=0.0, step=0.01, key="entry_cost")
+        with col6:
+            # This uses number keyboard by default on mobile
+            selling = st.number_input("Selling Price", min_value=0.0, value=0.0, step=0.01, key="entry_selling")
+
+        # Calculate and display GP%
+        temp_cost = float(cost)
+        temp_selling = float(selling)
+            
+        gp = ((temp_selling - temp_cost) / temp_cost * 100) if temp_cost else 0
+        st.info(f"💹 **GP% (Profit Margin)**: {gp:.2f}%")
+
+        # --- Remarks and Submit Button ---
+        st.text_area("Remarks [if any]", value="", key="entry_remarks")
+
+        # Form submission button (only this button adds the item).
+        # The callback adds the item before the fragment redraws, so no extra rerun is needed.
+        st.form_submit_button(
+            "➕ Add to List", 
+            type="primary",
+            on_click=add_item_from_form,
+            args=(outlet_name, form_type),
+        )
+        # --- End of the Item Entry Form ---
+
+    items_list_fragment(outlet_name, form_type)
+
+
 # ==========================================
 # PAGE SELECTION
 # ==========================================
@@ -285,6 +543,7 @@ if not st.session_state.logged_in:
         if username == "almadina" and pwd == password:
             st.session_state.logged_in = True
             st.session_state.selected_outlet = outlet
+            restore_draft()
             st.rerun()
         else:
             st.error("❌ Invalid username or password")
@@ -293,7 +552,7 @@ else:
     # APPLY CUSTOM CSS FOR RATING BOXES HERE
     st.markdown(CUSTOM_RATING_CSS, unsafe_allow_html=True) 
     
-    page = st.sidebar.radio("📌 Select Page", ["Outlet Dashboard", "Customer Feedback"])
+    page = st.sidebar.radio("📌 Select Page", ["Outlet Dashboard", "Upcoming Expiry", "Customer Feedback"])
 
     # ==========================================
     # OUTLET DASHBOARD
@@ -318,169 +577,35 @@ else:
         )
         st.markdown("---")
 
-        # --- 1. Dedicated Lookup Form (Enter key only triggers search/filter) ---
-        with st.form("barcode_lookup_form", clear_on_submit=False):
-            
-            col_bar, col_btn = st.columns([5, 1])
-            
-            with col_bar:
-                # Barcode Lookup remains st.text_input, but JS will set inputmode='numeric'
-                st.text_input(
-                    "Barcode Lookup",
-                    key="lookup_barcode_input", 
-                    placeholder="Enter or scan barcode and press Enter to search details",
-                    value=st.session_state.barcode_value
-                )
-            
-            with col_btn:
-                st.markdown("<div style='height: 33px;'></div>", unsafe_allow_html=True) # Spacer
-                st.form_submit_button(
-                    "🔍 Search", 
-                    on_click=lookup_item_and_update_state, 
-                    help="Click or press Enter in the barcode field to look up item.",
-                    type="secondary",
-                    use_container_width=True
-                )
-
-        # --- 2. Item Details Display Panel (The 'Filter' result) ---
-        if not st.session_state.lookup_data.empty:
-            st.markdown("### 🔍 Found Item Details")
-            st.dataframe(st.session_state.lookup_data, use_container_width=True, hide_index=True)
-        
-        # --- 2b. Manual Entry Fallback ---
-        # Show manual entry fields ONLY if a search was done and the barcode was NOT found
-        if st.session_state.barcode_value.strip() and not st.session_state.barcode_found:
-             st.markdown("### ⚠️ Manual Item Entry (Barcode Not Found)")
-             col_manual_name, col_manual_supplier = st.columns(2)
-             with col_manual_name:
-                 st.text_input(
-                     "Item Name (Manual)", 
-                     value=st.session_state.item_name_input, 
-                     key="temp_item_name_manual", 
-                     on_change=update_item_name_state
-                 )
-             with col_manual_supplier:
-                 st.text_input(
-                     "Supplier Name (Manual)", 
-                     value=st.session_state.supplier_input, 
-                     key="temp_supplier_manual", 
-                     on_change=update_supplier_state
-                 )
-
-        # Separator only if a search has happened
-        if st.session_state.barcode_value.strip():
-             st.markdown("---") 
-
-
-        # --- 3. Start of the Main Item Entry Form ---
-        with st.form("item_entry_form", clear_on_submit=True): 
-            
-            # --- Row 1: Qty and Expiry ---
-            col1, col2 = st.columns(2)
-            with col1:
-                qty = st.number_input("Qty [PCS]", min_value=1, value=1, step=1)
-            with col2:
-                if form_type != "Damages":
-                    expiry = st.date_input("Expiry Date", datetime.now().date())
-                else:
-                    expiry = None
-
-            # --- Row 2: Cost, Selling (Already st.number_input) ---
-            col5, col6 = st.columns(2)
-            with col5:
-                # This uses number keyboard by default on mobile
-                cost = st.number_input("Cost", min_value=0.0, value=0.0, step=0.01)
-            with col6:
-                # This uses number keyboard by default on mobile
-                selling = st.number_input("Selling Price", min_value=0.0, value=0.0, step=0.01)
-
-            # Calculate and display GP%
-            temp_cost = float(cost)
-            temp_selling = float(selling)
-                
-            gp = ((temp_selling - temp_cost) / temp_cost * 100) if temp_cost else 0
-            st.info(f"💹 **GP% (Profit Margin)**: {gp:.2f}%")
-
-            # --- Remarks and Submit Button ---
-            remarks = st.text_area("Remarks [if any]", value="")
+        # --- 1-3. Lookup, entry form and item list re-execute as fragments ---
+        item_entry_fragment(outlet_name, form_type)
 
-            # Form submission button (only this button adds the item)
-            submitted_item = st.form_submit_button(
-                "➕ Add to List", 
-                type="primary",
-            )
-            # --- End of the Item Entry Form ---
+    
+    # ==========================================
+    # UPCOMING EXPIRY (from submitted lists)
+    # ==========================================
+    elif page == "Upcoming Expiry":
+        outlet_name = st.session_state.selected_outlet
+        st.title("⏰ Upcoming Expiry")
+        st.markdown(f"Submitted Expiry / Near Expiry items for **{outlet_name}**")
+        st.markdown("---")
 
-        # --------------------------------------------------------
-        # --- Handle Main Form Submission ONLY on Button Click ---
-        # --------------------------------------------------------
-        if submitted_item:
-            
-            final_item_name = st.session_state.item_name_input
-            final_supplier = st.session_state.supplier_input
-            final_staff_name = st.session_state.staff_name 
+        expiry_index = get_expiry_index()
+        days_ahead = st.number_input("Expiring within (days)", min_value=1, max_value=365, value=7, step=1)
+        upcoming = expiry_index.expiring(days_ahead, outlets=[outlet_name])
 
-            if not st.session_state.barcode_value.strip():
-                 st.toast("❌ Please enter a Barcode before adding to the list.", icon="❌")
-                 st.rerun() 
-            
-            if not final_staff_name.strip():
-                st.toast("❌ Please enter your Staff Name before adding to the list.", icon="❌")
-                st.rerun()
+        suppliers = sorted(upcoming["Supplier"].unique().tolist())
+        selected_suppliers = st.multiselect("Supplier", suppliers)
+        if selected_suppliers:
+            upcoming = upcoming[upcoming["Supplier"].isin(selected_suppliers)]
 
-            success = process_item_entry(
-                st.session_state.barcode_value, 
-                final_item_name,                 
-                qty,         
-                cost,    
-                selling, 
-                expiry,      
-                final_supplier,                  
-                remarks,     
-                form_type,   
-                outlet_name,
-                final_staff_name 
-            )
-            
-            if success:
-                 st.rerun()
-
-
-        # Displaying and managing the list
-        if st.session_state.submitted_items:
-            st.markdown("### 🧾 Items Added")
-            df = pd.DataFrame(st.session_state.submitted_items)
-            st.dataframe(df, use_container_width=True, hide_index=True)
-
-            col_submit, col_delete = st.columns([1, 1])
-            with col_submit:
-                if st.button("📤 Submit All", type="primary"):
-                    st.success(f"✅ All {len(st.session_state.submitted_items)} items submitted for {outlet_name} (demo). Resetting.")
-                    
-                    # FINAL RESET OF ITEM LOOKUP DATA AND STAFF NAME
-                    st.session_state.submitted_items = []
-                    st.session_state.barcode_value = ""
-                    st.session_state.item_name_input = ""
-                    st.session_state.supplier_input = ""
-                    st.session_state.barcode_found = False
-                    st.session_state.temp_item_name_manual = "" 
-                    st.session_state.temp_supplier_manual = "" 
-                    st.session_state.lookup_data = pd.DataFrame() 
-                    st.session_state.staff_name = "" 
-                    st.rerun() 
-
-            with col_delete:
-                options = [f"{i+1}. {item['Item Name']} ({item['Qty']} pcs)" for i, item in enumerate(st.session_state.submitted_items)]
-                if options:
-                    to_delete = st.selectbox("Select Item to Delete", ["Select item to remove..."] + options)
-                    if to_delete != "Select item to remove...":
-                        if st.button("❌ Delete Selected", type="secondary"):
-                            index = options.index(to_delete) 
-                            st.session_state.submitted_items.pop(index)
-                            st.success("✅ Item removed")
-                            st.rerun()
+        if upcoming.empty:
+            st.info(f"No submitted items expire in the next {days_ahead} days.")
+        else:
+            st.dataframe(upcoming, use_container_width=True, hide_index=True)
+            download_buttons(upcoming, f"{outlet_name}_pull_list".replace(" ", "_"), key="pull_list_export",
+                             sales_col="Amount", profit_col=None)
 
-    
     # ==========================================
     # CUSTOMER FEEDBACK PAGE (MODIFIED: RATING BOXES)
     # ==========================================
@@ -0,0 +1,155 @@
+import argparse
+import os
+import sys
+import threading
+import time
+from bisect import bisect_left, bisect_right, insort
+from datetime import date, datetime, timedelta
+
+import pandas as pd
+
+from outlet_data import DATA_DIR
+from query_engine import load_submissions
+
+# ===============================
+# SETTINGS
+# ===============================
+EXPIRY_FORM_TYPES = ("Expiry", "Near Expiry")
+PULL_LIST_DAYS = 7            # daily pull list covers items expiring within this many days
+PULL_LIST_TIME = "06:00"      # local time the scheduler writes the daily pull list
+PULL_LIST_DIR = os.path.join(DATA_DIR, "pull_lists")
+
+PULL_LIST_COLUMNS = ["Outlet", "Supplier", "Expiry", "Days Left", "Barcode", "Item Name", "Qty",
+                     "Cost", "Amount", "Form Type", "Staff Name", "Submitted At"]
+
+
+# ===============================
+# EXPIRY INDEX
+# ===============================
+class ExpiryIndex:
+    """
+    Submitted Expiry / Near Expiry records kept in per-outlet lists sorted by expiry date.
+    A date-range query is two bisects per outlet plus the matching rows.
+    """
+
+    def __init__(self):
+        self._keys = {}      # outlet -> sorted [(expiry ordinal, seq)]
+        self._records = {}   # (outlet, seq) -> record dict
+        self._seq = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._records)
+
+    @classmethod
+    def from_submissions(cls, submissions=None):
+        index = cls()
+        index.add_records(load_submissions() if submissions is None else submissions)
+        return index
+
+    def add_records(self, submissions):
+        """Adds records from the submissions table (snake_case columns, as in query_engine)."""
+        if submissions is None or len(submissions) == 0:
+            return 0
+        df = pd.DataFrame(submissions)
+        df = df[df["form_type"].isin(EXPIRY_FORM_TYPES)]
+        df = df.assign(expiry=pd.to_datetime(df["expiry"], errors="coerce")).dropna(subset=["expiry"])
+
+        with self._lock:
+            for record in df.to_dict("records"):
+                self._seq += 1
+                outlet = record["outlet"]
+                expiry = record["expiry"].date()
+                record["expiry"] = expiry
+                insort(self._keys.setdefault(outlet, []), (expiry.toordinal(), self._seq))
+                self._records[(outlet, self._seq)] = record
+        return len(df)
+
+    def expiring(self, days, outlets=None, suppliers=None, today=None):
+        """Records expiring between today and today + days (inclusive), as a pull-list frame."""
+        today = today or date.today()
+        lo, hi = today.toordinal(), (today + timedelta(days=days)).toordinal()
+
+        rows = []
+        with self._lock:
+            for outlet in (outlets or list(self._keys)):
+                keys = self._keys.get(outlet, [])
+                start = bisect_left(keys, (lo, 0))
+                stop = bisect_right(keys, (hi, float("inf")))
+                rows.extend(self._records[(outlet, seq)] for _, seq in keys[start:stop])
+
+        if suppliers:
+            rows = [r for r in rows if r.get("supplier") in suppliers]
+        if not rows:
+            return pd.DataFrame(columns=PULL_LIST_COLUMNS)
+
+        df = pd.DataFrame(rows)
+        pull = pd.DataFrame({
+            "Outlet": df["outlet"],
+            "Supplier": df["supplier"].fillna(""),
+            "Expiry": df["expiry"],
+            "Days Left": df["expiry"].map(lambda d: (d - today).days),
+            "Barcode": df["barcode"],
+            "Item Name": df["item_name"],
+            "Qty": df["qty"],
+            "Cost": df["cost"],
+            "Amount": df["amount"],
+            "Form Type": df["form_type"],
+            "Staff Name": df["staff_name"],
+            "Submitted At": df["submitted_at"],
+        })
+        return pull.sort_values(["Outlet", "Supplier", "Expiry"], kind="stable").reset_index(drop=True)
+
+
+# ===============================
+# DAILY PULL LISTS
+# ===============================
+def write_pull_lists(index, days=PULL_LIST_DAYS, today=None):
+    """Writes data_store/pull_lists/<date>/<outlet>.csv plus all_outlets.csv. Returns the folder."""
+    today = today or date.today()
+    pull = index.expiring(days, today=today)
+    folder = os.path.join(PULL_LIST_DIR, today.isoformat())
+    os.makedirs(folder, exist_ok=True)
+    pull.to_csv(os.path.join(folder, "all_outlets.csv"), index=False)
+    for outlet, rows in pull.groupby("Outlet"):
+        rows.to_csv(os.path.join(folder, f"{outlet}.csv"), index=False)
+    return folder
+
+
+def _seconds_until(at, now=None):
+    now = now or datetime.now()
+    hour, minute = (int(part) for part in at.split(":"))
+    next_run = now.replace(hour=hour, minute=minute, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return (next_run - now).total_seconds()
+
+
+def run_scheduler(days=PULL_LIST_DAYS, at=PULL_LIST_TIME, stop_event=None):
+    """
+    Writes the pull lists every day at the given time, rebuilding the index from the store.
+    Run it from one place only (python expiry_alerts.py), not from every app process.
+    """
+    stop_event = stop_event or threading.Event()
+    while not stop_event.wait(_seconds_until(at)):
+        try:
+            folder = write_pull_lists(ExpiryIndex.from_submissions(), days=days)
+            print(f"Pull lists written to {folder}")
+        except Exception as e:   # a half-written submissions part or a disk error: retry tomorrow
+            print(f"Pull list run failed: {e}", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Near-expiry pull lists from submitted expiry records")
+    parser.add_argument("--days", type=int, default=PULL_LIST_DAYS, help="look-ahead window in days")
+    parser.add_argument("--at", default=PULL_LIST_TIME, help="daily run time (HH:MM)")
+    parser.add_argument("--once", action="store_true", help="write today's pull lists and exit")
+    args = parser.parse_args()
+
+    if args.once:
+        started = time.perf_counter()
+        folder = write_pull_lists(ExpiryIndex.from_submissions(), days=args.days)
+        print(f"Pull lists written to {folder} in {time.perf_counter() - started:.2f}s")
+    else:
+        print(f"Writing pull lists daily at {args.at} (next {args.days} days). Ctrl+C to stop.")
+        run_scheduler(args.days, args.at)
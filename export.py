@@ -0,0 +1,117 @@
+import io
+import re
+
+import pandas as pd
+import streamlit as st
+from openpyxl import Workbook
+
+# ===============================
+# SETTINGS
+# ===============================
+# st.download_button sends the whole file from memory, so exports are built in memory too.
+# Larger frames get disabled buttons; filter them down first.
+EXPORT_MAX_ROWS = 200_000
+CHUNK_ROWS = 5000   # rows converted to Excel cell values per step
+QTY_COL = "Qty"     # summed in the per-outlet summary alongside sales and profit
+
+CSV_MIME = "text/csv"
+EXCEL_MIME = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+
+
+def _chunks(df, chunk_rows=CHUNK_ROWS):
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+
+# ===============================
+# CSV
+# ===============================
+def csv_file(df):
+    """The frame as UTF-8 CSV bytes (built in memory; see EXPORT_MAX_ROWS)."""
+    return df.to_csv(index=False).encode("utf-8")
+
+
+# ===============================
+# EXCEL
+# ===============================
+def _sheet_title(name, used):
+    """Excel sheet names: max 31 chars, no []:*?/\\ and unique within the workbook."""
+    title = re.sub(r"[\[\]:*?/\\]", "-", str(name)).strip()[:31] or "Sheet"
+    base, n = title, 2
+    while title.lower() in used:
+        suffix = f" ({n})"
+        title = base[:31 - len(suffix)] + suffix
+        n += 1
+    used.add(title.lower())
+    return title
+
+
+def _append_rows(ws, df):
+    ws.append([str(col) for col in df.columns])
+    for chunk in _chunks(df):
+        chunk = chunk.astype(object).where(chunk.notna(), None)
+        for row in chunk.itertuples(index=False, name=None):
+            ws.append(row)
+
+
+def outlet_summary(df, group_col="Outlet", sales_col="Total Sales", profit_col="Total Profit"):
+    """Per-outlet row counts, qty/sales/profit totals and margin %, plus a grand total row."""
+    total_cols = [col for col in (QTY_COL, sales_col, profit_col) if col and col in df.columns]
+    summary = df.groupby(group_col)[total_cols].sum()
+    summary.insert(0, "Rows", df.groupby(group_col).size())
+    summary.loc["Total"] = summary.sum()
+    summary["Rows"] = summary["Rows"].astype(int)
+    if QTY_COL in summary.columns and pd.api.types.is_integer_dtype(df[QTY_COL]):
+        summary[QTY_COL] = summary[QTY_COL].astype(int)
+    if sales_col in summary.columns and profit_col in summary.columns:
+        sales = summary[sales_col].where(summary[sales_col] != 0)
+        summary["Margin %"] = (summary[profit_col] / sales * 100).round(2)
+    return summary.reset_index().rename(columns={"index": group_col})
+
+
+def excel_file(df, group_col="Outlet", sales_col="Total Sales", profit_col="Total Profit"):
+    """
+    Builds a workbook with a Summary sheet and one sheet per outlet using openpyxl's
+    write-only mode, so rows are not held as cell objects. Returns the .xlsx bytes; the
+    finished file is held in memory (see EXPORT_MAX_ROWS).
+    """
+    wb = Workbook(write_only=True)
+    used = set()
+
+    ws = wb.create_sheet(_sheet_title("Summary", used))
+    if group_col in df.columns:
+        _append_rows(ws, outlet_summary(df, group_col, sales_col, profit_col))
+        for outlet, rows in df.groupby(group_col, sort=True):
+            _append_rows(wb.create_sheet(_sheet_title(outlet, used)), rows)
+    else:
+        _append_rows(ws, df)
+
+    out = io.BytesIO()
+    wb.save(out)
+    return out.getvalue()
+
+
+# ===============================
+# STREAMLIT HELPER
+# ===============================
+def download_buttons(df, name, key, group_col="Outlet", sales_col="Total Sales", profit_col="Total Profit"):
+    """
+    CSV and Excel download buttons; the files are only generated when a button is clicked.
+    Frames over EXPORT_MAX_ROWS get disabled buttons instead of an in-memory file that size.
+    """
+    stamp = pd.Timestamp.now().strftime("%Y%m%d_%H%M")
+    too_large = len(df) > EXPORT_MAX_ROWS
+    help_text = f"{len(df):,} rows; filter to {EXPORT_MAX_ROWS:,} or fewer to export." if too_large else None
+    col_csv, col_xlsx = st.columns(2)
+    with col_csv:
+        st.download_button(
+            "⬇️ Download CSV", data=b"" if too_large else lambda: csv_file(df),
+            file_name=f"{name}_{stamp}.csv", mime=CSV_MIME, key=f"{key}_csv", on_click="ignore",
+            disabled=too_large, help=help_text, use_container_width=True
+        )
+    with col_xlsx:
+        st.download_button(
+            "⬇️ Download Excel", data=b"" if too_large else lambda: excel_file(df, group_col, sales_col, profit_col),
+            file_name=f"{name}_{stamp}.xlsx", mime=EXCEL_MIME, key=f"{key}_xlsx", on_click="ignore",
+            disabled=too_large, help=help_text, use_container_width=True
+        )
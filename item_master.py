@@ -0,0 +1,199 @@
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from outlet_data import DATA_DIR
+
+# ===============================
+# SETTINGS
+# ===============================
+ITEM_MASTER_FILE = "alllist.xlsx"
+KEY_COLUMN = "Item Bar Code"
+REQUIRED_COLUMNS = [KEY_COLUMN, "Item Name", "LP Supplier"]
+REFRESH_INTERVAL = 60   # seconds between checks of the workbook's modification time
+
+# data_store/item_master/
+#   current.parquet    latest ingested version (all columns as text)
+#   manifest.json      version number, source mtime, row count
+#   changelog.csv      one row per inserted / updated / removed barcode, per version
+ITEM_MASTER_DIR = os.path.join(DATA_DIR, "item_master")
+SNAPSHOT_FILE = os.path.join(ITEM_MASTER_DIR, "current.parquet")
+MANIFEST_FILE = os.path.join(ITEM_MASTER_DIR, "manifest.json")
+CHANGELOG_FILE = os.path.join(ITEM_MASTER_DIR, "changelog.csv")
+CHANGELOG_COLUMNS = ["Version", "Changed At", "Change", "Barcode", "Item Name", "Changed Columns"]
+
+
+# ===============================
+# READING AND DIFFING
+# ===============================
+def read_item_master(path=ITEM_MASTER_FILE):
+    """Reads an item master export as text, one row per barcode (the last row wins on duplicates)."""
+    df = pd.read_excel(path, dtype=str)
+    df.columns = df.columns.str.strip()
+    missing = [col for col in REQUIRED_COLUMNS if col not in df.columns]
+    if missing:
+        raise ValueError(f"Missing critical column(s) in {os.path.basename(path)}: {', '.join(missing)}")
+
+    df = df.fillna("").apply(lambda col: col.str.strip())
+    df = df[df[KEY_COLUMN] != ""]
+    return df.drop_duplicates(KEY_COLUMN, keep="last").set_index(KEY_COLUMN)
+
+
+def diff_item_master(old, new):
+    """
+    Compares two versions indexed by barcode.
+    Returns (inserted, updated, removed, changed_columns): inserted/updated are rows of `new`,
+    removed is an index of barcodes, changed_columns maps updated barcodes to "col, col".
+    """
+    columns = old.columns.union(new.columns, sort=False)
+    old = old.reindex(columns=columns, fill_value="")
+    new = new.reindex(columns=columns, fill_value="")
+
+    inserted = new.loc[new.index.difference(old.index, sort=False)]
+    removed = old.index.difference(new.index, sort=False)
+
+    common = new.index.intersection(old.index, sort=False)
+    changed = new.loc[common] != old.loc[common]
+    changed = changed[changed.any(axis=1)]
+    updated = new.loc[changed.index]
+    changed_columns = changed.dot(columns + ", ").str.rstrip(", ")
+    return inserted, updated, removed, changed_columns
+
+
+# ===============================
+# ITEM MASTER
+# ===============================
+class ItemMaster:
+    """
+    Barcode -> item record lookup backed by a versioned store.
+    refresh() re-reads the workbook only when its modification time changes and applies just
+    the inserted, updated and removed barcodes to the lookup dict, so lookups keep running
+    against the previous version while a new export is being read.
+    """
+
+    def __init__(self):
+        self._items = {}      # barcode -> {column: value}
+        self._frame = pd.DataFrame(columns=REQUIRED_COLUMNS[1:]).rename_axis(KEY_COLUMN)
+        self.version = 0
+        self.source_mtime = None
+        self._lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    @classmethod
+    def load(cls):
+        """The last stored version; call refresh() to pick up a newer export of the workbook."""
+        master = cls()
+        if os.path.exists(SNAPSHOT_FILE) and os.path.exists(MANIFEST_FILE):
+            with open(MANIFEST_FILE) as f:
+                manifest = json.load(f)
+            master._frame = pd.read_parquet(SNAPSHOT_FILE)
+            master._items = master._frame.to_dict("index")
+            master.version = manifest["version"]
+            master.source_mtime = manifest["source_mtime"]
+        return master
+
+    def lookup(self, barcode):
+        return self._items.get(str(barcode).strip())
+
+    def barcodes(self):
+        return list(self._items)
+
+    def refresh(self, path=ITEM_MASTER_FILE, force=False):
+        """
+        Ingests the workbook if it changed since the stored version.
+        Returns a dict of change counts, or None when there was nothing to do.
+        """
+        if not os.path.exists(path):
+            return None
+        mtime = os.path.getmtime(path)
+        if mtime == self.source_mtime and not force:
+            return None
+        # One reader at a time; a concurrent caller just keeps the current version
+        if not self._refresh_lock.acquire(blocking=False):
+            return None
+        try:
+            new = read_item_master(path)
+            inserted, updated, removed, changed_columns = diff_item_master(self._frame, new)
+            with self._lock:
+                for barcode in removed:
+                    self._items.pop(barcode, None)
+                self._items.update(inserted.to_dict("index"))
+                self._items.update(updated.to_dict("index"))
+                self._frame = new
+                self.source_mtime = mtime
+                if len(inserted) or len(updated) or len(removed):
+                    self.version += 1
+            self._save(inserted, updated, removed, changed_columns)
+            return {"version": self.version, "inserted": len(inserted),
+                    "updated": len(updated), "removed": len(removed)}
+        finally:
+            self._refresh_lock.release()
+
+    def _save(self, inserted, updated, removed, changed_columns):
+        os.makedirs(ITEM_MASTER_DIR, exist_ok=True)
+        changes = len(inserted) + len(updated) + len(removed)
+        if changes:
+            self._frame.to_parquet(SNAPSHOT_FILE)
+            log = pd.concat([
+                pd.DataFrame({"Change": "inserted", "Barcode": inserted.index,
+                              "Item Name": inserted["Item Name"].values, "Changed Columns": ""}),
+                pd.DataFrame({"Change": "updated", "Barcode": updated.index,
+                              "Item Name": updated["Item Name"].values,
+                              "Changed Columns": changed_columns.values}),
+                pd.DataFrame({"Change": "removed", "Barcode": removed, "Item Name": "",
+                              "Changed Columns": ""}),
+            ], ignore_index=True)
+            log.insert(0, "Changed At", datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            log.insert(0, "Version", self.version)
+            log[CHANGELOG_COLUMNS].to_csv(CHANGELOG_FILE, mode="a", index=False,
+                                          header=not os.path.exists(CHANGELOG_FILE))
+        with open(MANIFEST_FILE, "w") as f:
+            json.dump({"version": self.version, "source_mtime": self.source_mtime,
+                       "rows": len(self._frame), "updated_at": datetime.now().isoformat()}, f, indent=2)
+
+    def start_watcher(self, path=ITEM_MASTER_FILE, interval=REFRESH_INTERVAL):
+        """Checks the workbook every `interval` seconds on a daemon thread; returns its stop event."""
+        stop_event = threading.Event()
+
+        def watch():
+            while not stop_event.wait(interval):
+                try:
+                    self.refresh(path)
+                except Exception as e:   # a half-written or malformed export: keep the current version
+                    print(f"Item master refresh failed: {e}", file=sys.stderr)
+
+        threading.Thread(target=watch, name="item-master-refresh", daemon=True).start()
+        return stop_event
+
+
+def load_changelog():
+    if not os.path.exists(CHANGELOG_FILE):
+        return pd.DataFrame(columns=CHANGELOG_COLUMNS)
+    return pd.read_csv(CHANGELOG_FILE, dtype={"Barcode": str}, keep_default_na=False)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Ingest an item master export and log the changes")
+    parser.add_argument("--file", default=ITEM_MASTER_FILE, help="item master workbook to ingest")
+    parser.add_argument("--force", action="store_true", help="re-read even if the file is unchanged")
+    parser.add_argument("--log", type=int, default=0, help="print the last N change-log rows")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    master = ItemMaster.load()
+    result = master.refresh(args.file, force=args.force)
+    print(f"Item master version {master.version}: {len(master):,} barcodes "
+          f"({time.perf_counter() - started:.2f}s)")
+    if result:
+        print(f"Changes: {result['inserted']} inserted, {result['updated']} updated, {result['removed']} removed")
+    if args.log:
+        print(load_changelog().tail(args.log).to_string(index=False))
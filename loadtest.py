@@ -0,0 +1,219 @@
+"""
+Headless load estimate for dailyreport.py.
+
+Drives N concurrent sessions through login -> barcode lookup -> add to list -> submit using
+Streamlit's AppTest and prints per-step latency percentiles and a memory estimate for each
+session count.
+
+What the numbers are (and are not):
+- AppTest swaps process-global state (the Runtime singleton, config options) on every run, so
+  sessions cannot share one process safely. Each session runs in its own worker process with
+  its own item master and expiry index; all workers start together and compete for the same
+  CPUs. The latencies show how script execution slows under CPU contention between independent
+  interpreters, not where a single `streamlit run` server saturates (one process, one GIL,
+  shared caches, websocket traffic).
+- AppTest reruns the whole script for every interaction, while a browser reruns only the
+  fragment involved (lookup, entry form or list). Step latencies are full-rerun costs, an
+  upper bound for what users see.
+- "Est. Memory MB" is not a measured server footprint. It is the largest per-process
+  baseline after loading the app (standing in for one server's shared caches) plus the
+  memory every session added on top of its own baseline.
+
+    python loadtest.py --sessions 1,4,8,16 --items 5
+"""
+import argparse
+import os
+import random
+import resource
+import shutil
+import sys
+import tempfile
+import threading
+import multiprocessing
+import time
+from collections import defaultdict
+
+import numpy as np
+import pandas as pd
+from streamlit.testing.v1 import AppTest
+
+APP_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dailyreport.py")
+ITEM_MASTER_FILE = "alllist.xlsx"
+OUTLETS = [
+    "Hilal", "Safa Super", "Azhar HP", "Azhar", "Blue Pearl", "Fida", "Hadeqat",
+    "Jais", "Sabah", "Sahat", "Shams salem", "Shams Liwan", "Superstore",
+    "Tay Tay", "Safa oudmehta", "Port saeed"
+]
+STEPS = ["login", "lookup", "add_item", "submit"]
+
+
+# ===============================
+# MEASUREMENT
+# ===============================
+def rss_mb():
+    """Current resident memory of this process in MB (Linux), else the peak."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError):
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+
+
+def sample_barcodes(n=200):
+    """Real barcodes from the item master when present, otherwise random ones (manual-entry path)."""
+    if os.path.exists(ITEM_MASTER_FILE):
+        codes = pd.read_excel(ITEM_MASTER_FILE, usecols=["Item Bar Code"])["Item Bar Code"]
+        codes = codes.dropna().astype(str).str.strip().unique().tolist()
+        if codes:
+            return random.sample(codes, min(n, len(codes)))
+    return [str(random.randint(10 ** 11, 10 ** 12)) for _ in range(n)]
+
+
+# ===============================
+# ONE SESSION
+# ===============================
+def timed(timings, step, action):
+    started = time.perf_counter()
+    at = action()
+    timings[step].append((time.perf_counter() - started) * 1000)
+    if at.exception:
+        raise RuntimeError(f"{step}: {at.exception[0].value}")
+    return at
+
+
+def run_session(session_id, items, barcodes, start_barrier, results, timeout):
+    timings = defaultdict(list)
+    errors = []
+    rss_loaded = rss_after = 0.0
+    try:
+        at = AppTest.from_file(APP_FILE, default_timeout=timeout)
+        at.run()
+        rss_loaded = rss_mb()
+        try:
+            start_barrier.wait(timeout)
+        except threading.BrokenBarrierError:
+            raise RuntimeError("round aborted before start (another session failed to load)") from None
+
+        def login():
+            at.text_input[0].input("almadina")
+            at.selectbox[0].select(OUTLETS[session_id % len(OUTLETS)])
+            at.text_input[1].input("123123")
+            return at.button[0].click().run()
+
+        timed(timings, "login", login)
+        at.text_input(key="staff_name_input_key").input(f"Load Tester {session_id}").run()
+
+        for _ in range(items):
+            barcode = random.choice(barcodes)
+
+            def lookup():
+                at.text_input(key="lookup_barcode_input").input(barcode)
+                return _click(at, "Search")
+
+            timed(timings, "lookup", lookup)
+            if not at.session_state["barcode_found"]:
+                at.text_input(key="temp_item_name_manual").input(f"Item {barcode}").run()
+            timed(timings, "add_item", lambda: _click(at, "Add to List"))
+
+        timed(timings, "submit", lambda: _click(at, "Submit All"))
+        rss_after = rss_mb()
+    except Exception as e:
+        errors.append(f"session {session_id}: {e}")
+        start_barrier.abort()   # release the other sessions and the parent if we never reached the start
+    results.put((dict(timings), errors, rss_loaded, rss_after))
+
+
+def _click(at, label):
+    button = next(b for b in at.button if label in b.label)
+    return button.click().run()
+
+
+# ===============================
+# ONE ROUND
+# ===============================
+def run_round(sessions, items, barcodes, timeout):
+    ctx = multiprocessing.get_context("fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn")
+    barrier = ctx.Barrier(sessions + 1)
+    results = ctx.Queue()
+    workers = [
+        ctx.Process(target=run_session, args=(i, items, barcodes, barrier, results, timeout))
+        for i in range(sessions)
+    ]
+    for worker in workers:
+        worker.start()
+    try:
+        barrier.wait(timeout)   # every session has loaded the app; start the clock
+    except threading.BrokenBarrierError:
+        pass   # a session failed or timed out while loading; its error comes back with the results
+    started = time.perf_counter()
+    collected = [results.get() for _ in workers]
+    elapsed = time.perf_counter() - started
+    for worker in workers:
+        worker.join()
+
+    timings = defaultdict(list)
+    errors = []
+    loaded, growth = [], []
+    for session_timings, session_errors, rss_loaded, rss_after in collected:
+        for step, values in session_timings.items():
+            timings[step].extend(values)
+        errors.extend(session_errors)
+        if rss_after:
+            loaded.append(rss_loaded)
+            growth.append(rss_after - rss_loaded)
+
+    rows = []
+    for step in STEPS:
+        values = np.array(timings.get(step, []))
+        if values.size == 0:
+            continue
+        rows.append({
+            "Sessions": sessions, "Step": step, "Count": values.size,
+            "p50 ms": np.percentile(values, 50), "p90 ms": np.percentile(values, 90),
+            "p99 ms": np.percentile(values, 99), "Max ms": values.max(),
+        })
+    summary = pd.DataFrame(rows).round(1)
+    app_mb = max(loaded) if loaded else 0.0
+    return summary, errors, elapsed, app_mb, sum(growth)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Concurrent load estimate for dailyreport.py (one process per session)")
+    parser.add_argument("--sessions", default="1,4,8,16", help="comma-separated session counts")
+    parser.add_argument("--items", type=int, default=3, help="items added per session before submit")
+    parser.add_argument("--timeout", type=float, default=120, help="per-run timeout in seconds")
+    parser.add_argument("--data-dir", help="store submissions here instead of a temp folder")
+    parser.add_argument("--csv", help="also write the results table to this CSV file")
+    args = parser.parse_args()
+
+    # Submissions from the test go to a throwaway store unless --data-dir is given.
+    # Must be set before the app (and so outlet_data) is first imported.
+    temp_dir = None if args.data_dir else tempfile.mkdtemp(prefix="loadtest_")
+    os.environ["SALES_DATA_DIR"] = args.data_dir or temp_dir
+    os.chdir(os.path.dirname(APP_FILE))
+
+    barcodes = sample_barcodes()
+    results = []
+    if args.data_dir:
+        print(f"Submissions stored in {args.data_dir}")
+    print("Sessions run in separate processes and every step is a full-script rerun: "
+          "latencies and memory are estimates, not a single server's numbers.")
+    try:
+        for sessions in [int(n) for n in args.sessions.split(",")]:
+            summary, errors, elapsed, app_mb, session_mb = run_round(sessions, args.items, barcodes, args.timeout)
+            summary["Est. Memory MB"] = round(app_mb + session_mb, 1)
+            results.append(summary)
+            print(f"\n=== {sessions} concurrent session(s): {elapsed:.1f}s wall, "
+                  f"est. app baseline {app_mb:.0f} MB + session growth {session_mb:.1f} MB, {len(errors)} error(s)")
+            if not summary.empty:
+                print(summary.drop(columns="Sessions").to_string(index=False))
+            for error in errors[:5]:
+                print(f"  ! {error}")
+    finally:
+        if temp_dir:
+            shutil.rmtree(temp_dir, ignore_errors=True)
+
+    if args.csv and results:
+        pd.concat(results, ignore_index=True).to_csv(args.csv, index=False)
+        print(f"\nResults written to {args.csv}")
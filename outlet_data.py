@@ -0,0 +1,370 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+# ===============================
+# SOURCE FILES
+# ===============================
+OUTLET_FILES = {
+    "Hilal": "Hilal oct.Xlsx",
+    "Safa Super": "Safa super oct.Xlsx",
+    "Azhar HP": "azhar HP oct.Xlsx",
+    "Azhar": "azhar Oct.Xlsx",
+    "Blue Pearl": "blue pearl oct.Xlsx",
+    "Fida": "fida oct.Xlsx",
+    "Hadeqat": "hadeqat oct.Xlsx",
+    "Jais": "jais oct.Xlsx",
+    "Sabah": "sabah oct.Xlsx",
+    "Sahat": "sahat oct.Xlsx",
+    "Shams salem": "shams salem oct.Xlsx",
+    "Shams Liwan": "liwan oct.Xlsx",
+    "Superstore": "superstore oct.Xlsx",
+    "Tay Tay": "tay tay oct.Xlsx",
+    "Safa oudmehta": "oudmehta oct.Xlsx",
+    "Port saeed": "Port saeed oct.Xlsx"
+}
+
+HISTORY_FILE = "jan to sep all.xlsx"
+
+# Generated files (parquet store, reports, drafts) live here
+DATA_DIR = os.environ.get("SALES_DATA_DIR", "data_store")
+
+# Outlet codes used in the Jan-Sep workbook -> outlet names used in the October files.
+# Codes without an entry here (e.g. AML) have no October workbook and are left out of the comparison.
+HISTORY_OUTLET_CODES = {
+    "HAM": "Hilal",
+    "SAM": "Safa Super",
+    "AZR": "Azhar HP",
+    "AZT": "Azhar",
+    "BPS": "Blue Pearl",
+    "FAH": "Fida",
+    "HAD": "Hadeqat",
+    "JZS": "Jais",
+    "SBM": "Sabah",
+    "SAD": "Sahat",
+    "SML": "Shams salem",
+    "LWN": "Shams Liwan",
+    "MSS": "Superstore",
+    "TTD": "Tay Tay",
+    "SAO": "Safa oudmehta",
+    "SPS": "Port saeed",
+}
+
+# ===============================
+# CURRENT PERIOD (partial month)
+# ===============================
+CURRENT_MONTH = "Oct-2025"
+CURRENT_PERIOD_DAYS = 18   # the October workbooks cover Oct 1-18
+CURRENT_MONTH_DAYS = 31
+
+# Flag thresholds for the variance table
+SALES_VARIANCE_THRESHOLD = 20.0   # % change of projected sales vs the Jan-Sep monthly average
+MARGIN_VARIANCE_THRESHOLD = 3.0   # change in margin % points vs the last history month
+
+ALL = "All"
+
+
+# ===============================
+# LOADERS
+# ===============================
+def load_outlet_sales(files=OUTLET_FILES):
+    """Reads every outlet workbook into one frame. Returns (df, missing_files)."""
+    all_data = []
+    missing = []
+    for outlet, file in files.items():
+        if os.path.exists(file):
+            df = pd.read_excel(file)
+            df["Outlet"] = outlet
+            all_data.append(df)
+        else:
+            missing.append(file)
+    df = pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
+    return df, missing
+
+
+def prepare_outlet_sales(df):
+    """Runs the data-quality checks and returns only the rows that are safe to sum."""
+    clean, _, _ = validate_outlet_sales(df)
+    return clean
+
+
+# ===============================
+# DATA QUALITY
+# ===============================
+MARGIN_LIMITS = (-100.0, 100.0)   # margins outside this range are reported as implausible
+
+# Checks that remove the row from the dashboard sums
+BLOCKING_CHECKS = ["Missing Category", "Non-numeric Sales/Profit", "No Sales but Profit"]
+# Checks that keep the row but report it (returns net negative sales and profit and stay in the totals)
+WARNING_CHECKS = ["Duplicate Item Code", "Implausible Margin", "Return / No Sales"]
+
+QUALITY_DIR = os.path.join(DATA_DIR, "quality")
+
+
+def validate_outlet_sales(df):
+    """
+    Vectorized validation of the combined outlet workbooks.
+    Returns (clean_df, issues_df, report_df): rows kept for the dashboards, every flagged
+    row with its issues, and per-outlet counts of each check.
+    """
+    df = df.copy()
+    raw_sales, raw_profit = df["Total Sales"], df["Total Profit"]
+    df["Total Sales"] = pd.to_numeric(raw_sales, errors="coerce")
+    df["Total Profit"] = pd.to_numeric(raw_profit, errors="coerce")
+    sales, profit = df["Total Sales"], df["Total Profit"]
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        margin = np.where(sales > 0, profit / sales * 100, np.nan)
+
+    # "string" keeps missing codes as <NA>; code-less rows are not duplicates of each other
+    item_code = df["Item Code"].astype("string").str.strip()
+    has_code = item_code.fillna("") != ""
+    flags = pd.DataFrame({
+        "Missing Category": df["Category"].isna(),
+        "Non-numeric Sales/Profit": (sales.isna() & raw_sales.notna()) | (profit.isna() & raw_profit.notna()),
+        "No Sales but Profit": (sales.fillna(0) <= 0) & (profit.fillna(0) > 0),
+        "Duplicate Item Code": has_code & pd.DataFrame({"Outlet": df["Outlet"], "Code": item_code}).duplicated(keep=False),
+        "Implausible Margin": (margin < MARGIN_LIMITS[0]) | (margin > MARGIN_LIMITS[1]),
+        "Return / No Sales": (sales.fillna(0) <= 0) & (profit.fillna(0) < 0),
+    }, index=df.index)
+
+    blocked = flags[BLOCKING_CHECKS].any(axis=1)
+    flagged = flags.any(axis=1)
+
+    df[["Total Sales", "Total Profit"]] = df[["Total Sales", "Total Profit"]].fillna(0)
+    df["Margin %"] = np.round(np.nan_to_num(margin, nan=0.0), 2)
+
+    issues = df[flagged].copy()
+    issues["Issues"] = flags[flagged].dot(pd.Index(flags.columns) + "; ").str.rstrip("; ")
+    issues["Excluded"] = blocked[flagged]
+
+    report = flags.groupby(df["Outlet"]).sum()
+    report.insert(0, "Rows", df.groupby("Outlet").size())
+    report["Excluded Rows"] = blocked.groupby(df["Outlet"]).sum()
+    report = report.reset_index()
+
+    return df[~blocked].reset_index(drop=True), issues.reset_index(drop=True), report
+
+
+def save_quality_report(report, issues):
+    """Persists the latest per-outlet counts and flagged rows under data_store/quality."""
+    os.makedirs(QUALITY_DIR, exist_ok=True)
+    stamp = pd.Timestamp.now().strftime("%Y-%m-%d %H:%M:%S")
+    report.assign(**{"Checked At": stamp}).to_csv(os.path.join(QUALITY_DIR, "quality_report.csv"), index=False)
+    issues.to_csv(os.path.join(QUALITY_DIR, "quality_issues.csv"), index=False)
+
+
+def load_history(file=HISTORY_FILE):
+    """Reads the Jan-Sep workbook as a long frame: Outlet, Category, Month, Sales, Profit."""
+    if not os.path.exists(file):
+        return pd.DataFrame(columns=["Outlet", "Category", "Month", "Sales", "Profit"])
+
+    df = pd.read_excel(file)
+    df.columns = df.columns.str.strip()
+
+    month_cols = [col for col in df.columns if "Total Sales" in col]
+    profit_cols = [col for col in df.columns if "Total Profit" in col]
+
+    sales_melted = df.melt(id_vars=["Category", "outlet"], value_vars=month_cols,
+                           var_name="Month", value_name="Sales")
+    profit_melted = df.melt(id_vars=["Category", "outlet"], value_vars=profit_cols,
+                            var_name="Month", value_name="Profit")
+    sales_melted["Month"] = sales_melted["Month"].str.extract(r"(\w+-\d{4})", expand=False)
+    profit_melted["Month"] = profit_melted["Month"].str.extract(r"(\w+-\d{4})", expand=False)
+
+    history = pd.merge(sales_melted, profit_melted, on=["Category", "outlet", "Month"])
+    history["Outlet"] = history["outlet"].map(HISTORY_OUTLET_CODES)
+    history = history[history["Outlet"].notna()].drop(columns="outlet")
+    history["Category"] = history["Category"].astype(str).str.strip()
+    for col in ["Sales", "Profit"]:
+        history[col] = pd.to_numeric(history[col], errors="coerce").fillna(0)
+
+    # Keep the workbook's month order (Jan-2025 ... Sep-2025)
+    month_order = list(dict.fromkeys(history["Month"]))
+    history["Month"] = pd.Categorical(history["Month"], categories=month_order, ordered=True)
+    return history[["Outlet", "Category", "Month", "Sales", "Profit"]].reset_index(drop=True)
+
+
+# ===============================
+# RANKINGS & LEADERBOARDS
+# ===============================
+def add_rankings(df):
+    """
+    Precomputes per-outlet and per-category rank columns (1 = best seller / worst margin)
+    and returns the frame ordered by Margin % so filtered views need no re-sort.
+    """
+    df = df.copy()
+    df["Outlet Sales Rank"] = df.groupby("Outlet")["Total Sales"].rank(ascending=False, method="min").astype(int)
+    df["Category Sales Rank"] = df.groupby("Category")["Total Sales"].rank(ascending=False, method="min").astype(int)
+    df["Outlet Margin Rank"] = df.groupby("Outlet")["Margin %"].rank(ascending=True, method="min").astype(int)
+    df["Category Margin Rank"] = df.groupby("Category")["Margin %"].rank(ascending=True, method="min").astype(int)
+    return df.sort_values("Margin %", ascending=True, kind="stable").reset_index(drop=True)
+
+
+def top_n(frame, column, n, largest=True):
+    """Returns the n rows with the largest (or smallest) values of column, using a partial sort."""
+    if frame.empty or n <= 0:
+        return frame.iloc[0:0]
+    values = frame[column].to_numpy(dtype=float)
+    keys = -values if largest else values
+    if n < len(keys):
+        picked = np.argpartition(keys, n - 1)[:n]
+    else:
+        picked = np.arange(len(keys))
+    picked = picked[np.argsort(keys[picked], kind="stable")]
+    return frame.iloc[picked]
+
+
+# ===============================
+# ITEM x OUTLET MATRIX
+# ===============================
+class ItemOutletMatrix:
+    """
+    Sparse item x outlet matrix of sales and profit in CSR layout: the outlets that stock
+    item i are indices[indptr[i]:indptr[i + 1]]. Built once per load.
+    """
+
+    def __init__(self, df):
+        grouped = (
+            df.assign(**{"Item Code": df["Item Code"].astype(str).str.strip()})
+            .groupby(["Item Code", "Outlet"], sort=True)
+            .agg(Items=("Items", "first"), Sales=("Total Sales", "sum"), Profit=("Total Profit", "sum"))
+            .reset_index()
+        )
+        self.outlets = sorted(grouped["Outlet"].unique().tolist())
+        outlet_pos = {outlet: i for i, outlet in enumerate(self.outlets)}
+
+        codes = grouped["Item Code"].to_numpy()
+        starts = np.flatnonzero(np.r_[True, codes[1:] != codes[:-1]])
+        self.indptr = np.r_[starts, len(codes)]
+        self.item_codes = codes[starts]
+        self.item_names = grouped["Items"].to_numpy()[starts]
+        self.row_of = {code: i for i, code in enumerate(self.item_codes)}
+
+        self.indices = grouped["Outlet"].map(outlet_pos).to_numpy()
+        self.sales = grouped["Sales"].to_numpy(dtype=float)
+        self.profit = grouped["Profit"].to_numpy(dtype=float)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.margin = np.where(self.sales > 0, self.profit / self.sales * 100, np.nan)
+
+        # Per-item margin spread across the outlets that sold it, for the divergence list
+        margins = pd.Series(self.margin, index=np.repeat(np.arange(len(starts)), np.diff(self.indptr)))
+        by_item = margins.groupby(level=0)
+        self.margin_spread = (by_item.max() - by_item.min()).reindex(range(len(starts))).to_numpy()
+        self.outlet_count = np.diff(self.indptr)
+
+    def __len__(self):
+        return len(self.item_codes)
+
+    def item_name(self, item_code):
+        i = self.row_of.get(str(item_code).strip())
+        return None if i is None else self.item_names[i]
+
+    def row(self, item_code, outlets=None):
+        """Per-outlet Sales, Profit and Margin % for one item code, optionally limited to outlets."""
+        i = self.row_of.get(str(item_code).strip())
+        if i is None:
+            return pd.DataFrame(columns=["Outlet", "Sales", "Profit", "Margin %"])
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        cols = self.indices[lo:hi]
+        row = pd.DataFrame({
+            "Outlet": [self.outlets[c] for c in cols],
+            "Sales": self.sales[lo:hi],
+            "Profit": self.profit[lo:hi],
+            "Margin %": np.round(self.margin[lo:hi], 2),
+        })
+        if outlets:
+            row = row[row["Outlet"].isin(outlets)]
+        return row.reset_index(drop=True)
+
+    def divergent_items(self, n, min_outlets=2):
+        """Items sold in at least min_outlets outlets with the widest margin spread."""
+        spread = pd.DataFrame({
+            "Item Code": self.item_codes,
+            "Items": self.item_names,
+            "Outlets": self.outlet_count,
+            "Margin Spread (pts)": np.round(self.margin_spread, 2),
+        })
+        spread = spread[(spread["Outlets"] >= min_outlets) & spread["Margin Spread (pts)"].notna()]
+        return top_n(spread, "Margin Spread (pts)", n).reset_index(drop=True)
+
+
+# ===============================
+# VARIANCE ENGINE
+# ===============================
+def _with_rollups(frame, value_cols, extra_keys=()):
+    """Sums value_cols at (Outlet, Category), (Outlet, All), (All, Category) and (All, All)."""
+    keys = list(extra_keys)
+    levels = [
+        frame,
+        frame.assign(Category=ALL),
+        frame.assign(Outlet=ALL),
+        frame.assign(Outlet=ALL, Category=ALL),
+    ]
+    stacked = pd.concat(levels, ignore_index=True)
+    return stacked.groupby(["Outlet", "Category"] + keys, observed=True)[value_cols].sum()
+
+
+def build_variance_table(sales_df, history_df,
+                         period_days=CURRENT_PERIOD_DAYS, month_days=CURRENT_MONTH_DAYS,
+                         sales_threshold=SALES_VARIANCE_THRESHOLD,
+                         margin_threshold=MARGIN_VARIANCE_THRESHOLD):
+    """
+    Aligns the month-to-date outlet data with the monthly history, indexed by (Outlet, Category).
+    Includes "All" roll-up rows so any sidebar selection is a single .loc lookup.
+    """
+    current = _with_rollups(sales_df[["Outlet", "Category", "Total Sales", "Total Profit"]],
+                            ["Total Sales", "Total Profit"])
+    current.columns = ["MTD Sales", "MTD Profit"]
+
+    run_rate = month_days / period_days
+    current["Projected Sales"] = current["MTD Sales"] * run_rate
+    current["Projected Profit"] = current["MTD Profit"] * run_rate
+
+    monthly = _with_rollups(history_df, ["Sales", "Profit"], extra_keys=["Month"])
+    sales_by_month = monthly["Sales"].unstack("Month")
+    profit_by_month = monthly["Profit"].unstack("Month")
+    months = list(sales_by_month.columns)
+
+    hist = pd.DataFrame(index=sales_by_month.index)
+    if months:
+        last_month = months[-1]
+        hist["Last Month Sales"] = sales_by_month[last_month]
+        hist["Last Month Profit"] = profit_by_month[last_month]
+        hist["Avg Monthly Sales"] = sales_by_month.mean(axis=1)
+        hist["Avg Monthly Profit"] = profit_by_month.mean(axis=1)
+    else:
+        for col in ["Last Month Sales", "Last Month Profit", "Avg Monthly Sales", "Avg Monthly Profit"]:
+            hist[col] = np.nan
+
+    table = current.join(hist, how="outer").fillna(0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        table["MTD Margin %"] = np.where(table["MTD Sales"] > 0,
+                                         table["MTD Profit"] / table["MTD Sales"] * 100, 0)
+        table["Last Month Margin %"] = np.where(table["Last Month Sales"] > 0,
+                                                table["Last Month Profit"] / table["Last Month Sales"] * 100, 0)
+        table["Δ Sales vs Last Month %"] = np.where(
+            table["Last Month Sales"] > 0,
+            (table["Projected Sales"] / table["Last Month Sales"] - 1) * 100, np.nan)
+        table["Δ Sales vs Avg %"] = np.where(
+            table["Avg Monthly Sales"] > 0,
+            (table["Projected Sales"] / table["Avg Monthly Sales"] - 1) * 100, np.nan)
+    table["Δ Margin pts"] = table["MTD Margin %"] - table["Last Month Margin %"]
+
+    # Flags: sales swing against the monthly average, or a margin move against the last month
+    above = table["Δ Sales vs Avg %"] >= sales_threshold
+    below = table["Δ Sales vs Avg %"] <= -sales_threshold
+    margin_drop = table["Δ Margin pts"] <= -margin_threshold
+    margin_gain = table["Δ Margin pts"] >= margin_threshold
+    new_line = (table["Avg Monthly Sales"] == 0) & (table["MTD Sales"] > 0)
+
+    flag = np.select([new_line, below, above], ["🆕 New", "⬇️ Below trend", "⬆️ Above trend"], default="")
+    margin_flag = np.select([margin_drop, margin_gain], ["⚠️ Margin drop", "✅ Margin gain"], default="")
+    table["Flag"] = pd.Series(flag, index=table.index).str.cat(
+        pd.Series(margin_flag, index=table.index), sep=" ").str.strip()
+
+    round_cols = [col for col in table.columns if col != "Flag"]
+    table[round_cols] = table[round_cols].round(2)
+    return table.sort_index()
@@ -0,0 +1,206 @@
+import json
+import os
+import shutil
+from datetime import datetime
+
+import duckdb
+import pandas as pd
+
+from outlet_data import (
+    DATA_DIR, OUTLET_FILES, HISTORY_FILE,
+    load_outlet_sales, prepare_outlet_sales, load_history
+)
+
+# ===============================
+# STORE LAYOUT
+# ===============================
+# data_store/
+#   outlet_sales/outlet=<name>/*.parquet    October item-wise sales
+#   history/outlet=<name>/*.parquet         Jan-Sep monthly category totals
+#   submissions/outlet=<name>/*.parquet     Expiry / Damages / Near Expiry lists from dailyreport.py
+STORE_DIRS = {
+    "outlet_sales": os.path.join(DATA_DIR, "outlet_sales"),
+    "history": os.path.join(DATA_DIR, "history"),
+    "submissions": os.path.join(DATA_DIR, "submissions"),
+}
+MANIFEST_FILE = os.path.join(DATA_DIR, "manifest.json")
+
+# Column types for tables that may not have any files yet
+EMPTY_SCHEMAS = {
+    "submissions": {
+        "form_type": "VARCHAR", "barcode": "VARCHAR", "item_name": "VARCHAR", "qty": "INTEGER",
+        "cost": "DOUBLE", "selling": "DOUBLE", "amount": "DOUBLE", "gp_pct": "DOUBLE",
+        "expiry": "DATE", "supplier": "VARCHAR", "remarks": "VARCHAR", "staff_name": "VARCHAR",
+        "submitted_at": "TIMESTAMP", "outlet": "VARCHAR",
+    },
+}
+
+SUBMISSION_COLUMNS = {
+    "Form Type": "form_type", "Barcode": "barcode", "Item Name": "item_name", "Qty": "qty",
+    "Cost": "cost", "Selling": "selling", "Amount": "amount", "GP%": "gp_pct", "Expiry": "expiry",
+    "Supplier": "supplier", "Remarks": "remarks", "Staff Name": "staff_name", "Outlet": "outlet",
+}
+
+# Statement types run_query accepts (SELECT also covers WITH, FROM, DESCRIBE, SHOW and SUMMARIZE)
+READ_ONLY_STATEMENTS = (duckdb.StatementType.SELECT, duckdb.StatementType.EXPLAIN)
+
+
+# ===============================
+# WRITING
+# ===============================
+def _source_signature():
+    """Modification times of the source workbooks; the store is rebuilt when these change."""
+    files = list(OUTLET_FILES.values()) + [HISTORY_FILE]
+    return {file: os.path.getmtime(file) for file in files if os.path.exists(file)}
+
+
+def _write_partitioned(con, df, target):
+    con.register("_source", df)
+    try:
+        con.execute(
+            f"COPY (SELECT * FROM _source) TO '{target}' "
+            "(FORMAT parquet, PARTITION_BY (outlet), OVERWRITE_OR_IGNORE)"
+        )
+    finally:
+        con.unregister("_source")
+
+
+def build_store(force=False):
+    """Writes the outlet sales and history workbooks to outlet-partitioned parquet if they changed."""
+    signature = _source_signature()
+    if not force and os.path.exists(MANIFEST_FILE):
+        with open(MANIFEST_FILE) as f:
+            if json.load(f).get("sources") == signature:
+                return False
+
+    raw_df, _ = load_outlet_sales()
+    sales = prepare_outlet_sales(raw_df) if not raw_df.empty else raw_df
+    history = load_history()
+
+    sales_table = pd.DataFrame({
+        "item_code": sales["Item Code"].astype(str).str.strip(),
+        "item": sales["Items"].astype(str),
+        "category": sales["Category"].astype(str),
+        "total_sales": sales["Total Sales"],
+        "total_profit": sales["Total Profit"],
+        "margin_pct": sales["Margin %"],
+        "outlet": sales["Outlet"],
+    })
+    history_table = pd.DataFrame({
+        "category": history["Category"],
+        "month": history["Month"].astype(str),
+        "month_start": pd.to_datetime(history["Month"].astype(str), format="%b-%Y"),
+        "sales": history["Sales"],
+        "profit": history["Profit"],
+        "outlet": history["Outlet"],
+    })
+
+    os.makedirs(DATA_DIR, exist_ok=True)
+    con = duckdb.connect()
+    for name, table in [("outlet_sales", sales_table), ("history", history_table)]:
+        target = STORE_DIRS[name]
+        shutil.rmtree(target, ignore_errors=True)
+        if not table.empty:
+            _write_partitioned(con, table, target)
+    con.close()
+
+    with open(MANIFEST_FILE, "w") as f:
+        json.dump({"sources": signature, "built_at": datetime.now().isoformat()}, f, indent=2)
+    return True
+
+
+def append_submissions(items):
+    """Appends a submitted dailyreport.py list (list of dicts) as a new parquet part per outlet.
+    Returns the rows as stored (snake_case columns)."""
+    if not items:
+        return pd.DataFrame(columns=list(EMPTY_SCHEMAS["submissions"]))
+    df = pd.DataFrame(items).rename(columns=SUBMISSION_COLUMNS)
+    df["expiry"] = pd.to_datetime(df["expiry"], format="%d-%b-%y", errors="coerce").dt.date
+    df["submitted_at"] = pd.Timestamp(datetime.now()).floor("s")
+    for col in EMPTY_SCHEMAS["submissions"]:
+        if col not in df.columns:
+            df[col] = None
+
+    os.makedirs(STORE_DIRS["submissions"], exist_ok=True)
+    con = duckdb.connect()
+    con.register("_source", df[list(EMPTY_SCHEMAS["submissions"])])
+    try:
+        con.execute(
+            f"COPY (SELECT * FROM _source) TO '{STORE_DIRS['submissions']}' "
+            "(FORMAT parquet, PARTITION_BY (outlet), APPEND, FILENAME_PATTERN 'part_{uuid}')"
+        )
+    finally:
+        con.close()
+    return df
+
+
+def load_submissions():
+    """All submitted records as a pandas frame (empty frame if nothing was submitted yet)."""
+    return run_query("SELECT * FROM submissions ORDER BY submitted_at")
+
+
+# ===============================
+# QUERYING
+# ===============================
+def _register_views(con):
+    for name, directory in STORE_DIRS.items():
+        pattern = os.path.join(os.path.abspath(directory), "*", "*.parquet")
+        has_files = os.path.isdir(directory) and any(
+            f.endswith(".parquet") for _, _, files in os.walk(directory) for f in files
+        )
+        if has_files:
+            con.execute(
+                f"CREATE OR REPLACE VIEW {name} AS "
+                f"SELECT * FROM read_parquet('{pattern}', hive_partitioning = true, union_by_name = true)"
+            )
+        elif name in EMPTY_SCHEMAS:
+            columns = ", ".join(f"CAST(NULL AS {dtype}) AS {col}" for col, dtype in EMPTY_SCHEMAS[name].items())
+            con.execute(f"CREATE OR REPLACE VIEW {name} AS SELECT {columns} WHERE false")
+
+
+def connect():
+    """
+    In-memory DuckDB connection with views over the parquet store (nothing is loaded up front).
+    File access is limited to the store folders and the settings are locked, so queries cannot
+    read other files, write files, attach databases or load extensions.
+    """
+    con = duckdb.connect()
+    _register_views(con)
+    allowed = ", ".join(f"'{os.path.abspath(directory)}'" for directory in STORE_DIRS.values())
+    con.execute(f"SET allowed_directories = [{allowed}]")
+    con.execute("SET enable_external_access = false")
+    con.execute("SET lock_configuration = true")
+    return con
+
+
+def run_query(sql, con=None):
+    """Runs exactly one read-only SQL statement and returns the result as a DataFrame."""
+    statements = duckdb.extract_statements(sql)
+    if len(statements) != 1:
+        raise ValueError("Run exactly one statement at a time.")
+    if statements[0].type not in READ_ONLY_STATEMENTS:
+        raise ValueError("Only read-only queries (SELECT / WITH / DESCRIBE / SHOW / EXPLAIN) are allowed.")
+    statement = statements[0]
+    own_connection = con is None
+    con = connect() if own_connection else con
+    try:
+        cursor = con.cursor()
+        _register_views(cursor)
+        return cursor.execute(statement).df()
+    finally:
+        if own_connection:
+            con.close()
+
+
+def table_schemas(con=None):
+    """Column names and types of every queryable table."""
+    return run_query(
+        "SELECT table_name, column_name, data_type FROM information_schema.columns "
+        "ORDER BY table_name, ordinal_position",
+        con,
+    )
+
+
+if __name__ == "__main__":
+    rebuilt = build_store(force=True)
+    print(f"Store written to {DATA_DIR}" if rebuilt else "Store already up to date")
@@ -0,0 +1,164 @@
+import abc
+import atexit
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+
+import pandas as pd
+
+from outlet_data import DATA_DIR
+
+# ===============================
+# SETTINGS
+# ===============================
+# Backend used by get_session_store(); "local" is the only built-in one
+SESSION_STORE_BACKEND = os.environ.get("SESSION_STORE_BACKEND", "local")
+SESSION_DB_FILE = os.path.join(DATA_DIR, "sessions.db")
+FLUSH_INTERVAL = 1.0   # seconds between write-behind flushes
+
+# dailyreport.py state that survives restarts and can move between processes
+PERSISTED_KEYS = ["submitted_items", "barcode_value", "item_name_input", "supplier_input",
+                  "barcode_found", "lookup_data", "staff_name"]
+
+
+# ===============================
+# SERIALIZATION
+# ===============================
+def encode_state(state):
+    """Compact representation of a session snapshot: minified JSON, zlib-compressed."""
+    snapshot = {}
+    for key in PERSISTED_KEYS:
+        if key not in state:
+            continue
+        value = state[key]
+        if isinstance(value, pd.DataFrame):
+            value = {"__frame__": value.to_dict("records")}
+        snapshot[key] = value
+    return zlib.compress(json.dumps(snapshot, separators=(",", ":"), default=str).encode("utf-8"))
+
+
+def decode_state(blob):
+    snapshot = json.loads(zlib.decompress(blob).decode("utf-8"))
+    for key, value in snapshot.items():
+        if isinstance(value, dict) and "__frame__" in value:
+            snapshot[key] = pd.DataFrame(value["__frame__"])
+    return snapshot
+
+
+# ===============================
+# BACKENDS
+# ===============================
+class SessionStore(abc.ABC):
+    """Interface for session-state backends. Keys are draft ids (one per outlet and device)."""
+
+    @abc.abstractmethod
+    def load(self, key):
+        pass
+
+    @abc.abstractmethod
+    def save(self, key, state):
+        pass
+
+    @abc.abstractmethod
+    def delete(self, key):
+        pass
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.flush()
+
+
+class LocalSessionStore(SessionStore):
+    """
+    SQLite file store with write-behind: save() only queues the encoded snapshot and a
+    background thread writes the latest snapshot per key every FLUSH_INTERVAL seconds.
+    WAL mode lets several Streamlit processes on the same machine share the file; a snapshot
+    equal to the stored row is skipped by the upsert itself, so it is compared with what the
+    last writer (in any process) stored.
+    """
+
+    def __init__(self, path=SESSION_DB_FILE, flush_interval=FLUSH_INTERVAL):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._path = path
+        self._pending = {}   # key -> encoded blob (None = delete)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+
+        with self._connect() as con:
+            con.execute("PRAGMA journal_mode=WAL")
+            con.execute(
+                "CREATE TABLE IF NOT EXISTS drafts ("
+                "key TEXT PRIMARY KEY, data BLOB NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+        self._flush_interval = flush_interval
+        self._thread = threading.Thread(target=self._flush_loop, name="session-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _connect(self):
+        return sqlite3.connect(self._path, timeout=10)
+
+    def load(self, key):
+        with self._lock:
+            if key in self._pending:
+                blob = self._pending[key]
+                return None if blob is None else decode_state(blob)
+        with self._connect() as con:
+            row = con.execute("SELECT data FROM drafts WHERE key = ?", (key,)).fetchone()
+        return decode_state(row[0]) if row else None
+
+    def save(self, key, state):
+        blob = encode_state(state)
+        with self._lock:
+            self._pending[key] = blob
+
+    def delete(self, key):
+        with self._lock:
+            self._pending[key] = None
+
+    def flush(self):
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        now = time.time()
+        with self._connect() as con:
+            for key, blob in pending.items():
+                if blob is None:
+                    con.execute("DELETE FROM drafts WHERE key = ?", (key,))
+                else:
+                    con.execute(
+                        "INSERT INTO drafts (key, data, updated_at) VALUES (?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at "
+                        "WHERE drafts.data IS NOT excluded.data",
+                        (key, blob, now),
+                    )
+
+    def _flush_loop(self):
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+    def close(self):
+        self._stop.set()
+        self.flush()
+
+
+BACKENDS = {"local": LocalSessionStore}
+
+
+def register_backend(name, store_class):
+    """Adds a SessionStore implementation (e.g. a shared network store) selectable by name."""
+    BACKENDS[name] = store_class
+
+
+def get_session_store(backend=None, **options):
+    backend = backend or SESSION_STORE_BACKEND
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown session store backend: {backend}")
+    return BACKENDS[backend](**options)
@@ -0,0 +1,85 @@
+import time
+
+import streamlit as st
+
+from query_engine import build_store, connect, run_query, table_schemas
+
+# ===============================
+# CONFIGURATION
+# ===============================
+st.set_page_config(page_title="Admin SQL Query", layout="wide")
+
+EXAMPLE_QUERIES = {
+    "GP% by category for Azhar and Azhar HP, excluding tobacco": """SELECT category,
+       SUM(total_sales)  AS sales,
+       SUM(total_profit) AS profit,
+       ROUND(SUM(total_profit) / NULLIF(SUM(total_sales), 0) * 100, 2) AS gp_pct
+FROM outlet_sales
+WHERE outlet IN ('Azhar', 'Azhar HP')
+  AND category <> 'TOBACCO&ACC'
+GROUP BY category
+ORDER BY sales DESC""",
+    "Monthly sales trend per outlet (Jan-Sep)": """SELECT outlet, month, SUM(sales) AS sales, SUM(profit) AS profit
+FROM history
+GROUP BY outlet, month, month_start
+ORDER BY outlet, month_start""",
+    "Expiry / damage value by outlet and form type": """SELECT outlet, form_type, COUNT(*) AS items, SUM(qty) AS qty, SUM(amount) AS amount
+FROM submissions
+GROUP BY outlet, form_type
+ORDER BY amount DESC""",
+}
+
+# ===============================
+# PASSWORD PROTECTION
+# ===============================
+if "authenticated" not in st.session_state:
+    st.session_state.authenticated = False
+
+if not st.session_state.authenticated:
+    st.title("🔒 Admin SQL Query")
+    password = st.text_input("Enter Password to Continue", type="password")
+    if st.button("Login"):
+        if password == "123123":
+            st.session_state.authenticated = True
+            st.rerun()
+        else:
+            st.error("❌ Incorrect password. Try again.")
+    st.stop()
+
+# ===============================
+# QUERY ENGINE
+# ===============================
+@st.cache_resource
+def get_connection():
+    # Converts the workbooks to partitioned parquet only when they changed since the last build
+    build_store()
+    return connect()
+
+con = get_connection()
+
+st.title("🧮 Admin SQL Query")
+st.caption("Read-only SQL over `outlet_sales`, `history` and `submissions`. "
+           "Filters on `outlet` only scan that outlet's files.")
+
+with st.sidebar:
+    st.header("📚 Tables")
+    schemas = table_schemas(con)
+    for table_name, columns in schemas.groupby("table_name"):
+        with st.expander(table_name):
+            st.dataframe(columns[["column_name", "data_type"]], hide_index=True, use_container_width=True)
+    if st.button("🔄 Rebuild store from workbooks"):
+        build_store(force=True)
+        st.success("✅ Store rebuilt.")
+
+example = st.selectbox("Example queries", ["Custom"] + list(EXAMPLE_QUERIES))
+sql = st.text_area("SQL", value=EXAMPLE_QUERIES.get(example, ""), height=220)
+
+if st.button("▶️ Run Query", type="primary") and sql.strip():
+    try:
+        started = time.perf_counter()
+        result = run_query(sql, con)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        st.success(f"✅ {len(result):,} rows in {elapsed_ms:.1f} ms")
+        st.dataframe(result, use_container_width=True, height=500)
+    except Exception as e:
+        st.error(f"❌ {e}")
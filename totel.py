@@ -3,6 +3,11 @@ import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 
+from category_hierarchy import CategoryRollup, load_hierarchy
+from daily_sales import daily_sales_version, load_daily_sales, show_daily_sales
+from export import download_buttons
+from outlet_data import HISTORY_OUTLET_CODES
+
 # ==============================
 # Page Setup
 # ==============================
@@ -42,11 +47,28 @@ profit_melted["Month"] = profit_melted["Month"].str.extract(r"(\w+-\d{4})")
 
 merged_df = pd.merge(sales_melted, profit_melted, on=["Category", "outlet", "Month"])
 
+@st.cache_resource
+def load_category_rollup():
+    # Subtotals for every (outlet, month, level, node) are built once; the charts below only look them up
+    return CategoryRollup(merged_df, load_hierarchy())
+
+rollup = load_category_rollup()
+
 # ==============================
 # Sidebar Filters
 # ==============================
 st.sidebar.header("🔍 Filters")
-categories = ["All"] + sorted(merged_df["Category"].unique().tolist())
+# Department (from category_hierarchy.csv, if present) narrows the category list
+selected_department = "All"
+if "Department" in rollup.levels:
+    departments = ["All"] + rollup.children("Total", "All")
+    selected_department = st.sidebar.selectbox("Select Department", departments)
+
+if selected_department != "All":
+    department_categories = rollup.children("Department", selected_department)
+    categories = ["All"] + department_categories
+else:
+    categories = ["All"] + sorted(merged_df["Category"].unique().tolist())
 selected_category = st.sidebar.selectbox("Select Category", categories)
 
 outlets = ["All"] + sorted(merged_df["outlet"].unique().tolist())
@@ -59,6 +81,8 @@ selected_month = st.sidebar.selectbox("Select Month", months)
 # Apply Filters
 # ==============================
 filtered_df = merged_df.copy()
+if selected_department != "All":
+    filtered_df = filtered_df[filtered_df["Category"].isin(department_categories)]
 if selected_category != "All":
     filtered_df = filtered_df[filtered_df["Category"] == selected_category]
 if selected_outlet != "All":
@@ -66,15 +90,22 @@ if selected_outlet != "All":
 if selected_month != "All":
     filtered_df = filtered_df[filtered_df["Month"] == selected_month]
 
+# Node of the hierarchy the filters point at; charts and metrics are lookups on it
+if selected_category != "All":
+    level, node = "Category", selected_category
+elif selected_department != "All":
+    level, node = "Department", selected_department
+else:
+    level, node = "Total", "All"
+
 # ==============================
 # Metrics
 # ==============================
-total_sales = filtered_df["Sales"].sum()
-total_profit = filtered_df["Profit"].sum()
+total_sales, total_profit = rollup.total(selected_outlet, selected_month, level, node)
 profit_margin = (total_profit / total_sales * 100) if total_sales > 0 else 0
 
 # Determine if Avg Monthly Sales should be shown
-show_avg = (selected_category != "All" or (selected_outlet != "All" and selected_category == "All"))
+show_avg = (node != "All" or (selected_outlet != "All" and selected_category == "All"))
 
 # Create columns dynamically
 if show_avg:
@@ -88,7 +119,7 @@ col2.metric("📈 Total Profit (GP)", f"{total_profit:,.2f}")
 col3.metric("📊 Profit Margin (%)", f"{profit_margin:.2f}%")
 
 if show_avg:
-    avg_monthly_sales = filtered_df.groupby("Month")["Sales"].sum().mean()
+    avg_monthly_sales = rollup.monthly(month_order, selected_outlet, level, node)["Sales"].mean()
     col4.metric("📅 Avg Monthly Sales", f"{avg_monthly_sales:,.2f}")
 
 # ==============================
@@ -97,7 +128,7 @@ if show_avg:
 if selected_month == "All":
     # Line charts for all months
     st.markdown("### 📦 Sales Trend by Month")
-    monthly_summary = filtered_df.groupby("Month")[["Sales", "Profit"]].sum().reindex(month_order)
+    monthly_summary = rollup.monthly(month_order, selected_outlet, level, node)
 
     fig = px.line(
         monthly_summary,
@@ -127,11 +158,15 @@ if selected_month == "All":
     st.plotly_chart(fig2, use_container_width=True)
 
 else:
-    # Horizontal category-wise bar chart for single month
-    st.subheader(f"📊 Category-wise Sales & Profit for {selected_month}")
-
-    category_summary = filtered_df.groupby("Category")[["Sales", "Profit"]].sum().reset_index()
+    # Horizontal bar chart for single month, one bar per child of the selected node
+    # (departments -> categories -> sub-categories); a leaf category shows just itself
+    child_level, category_summary = rollup.breakdown(selected_outlet, selected_month, level, node)
+    if child_level is None:
+        child_level = level
+        category_summary = pd.DataFrame([(node, total_sales, total_profit)], columns=[level, "Sales", "Profit"])
+    category_summary = category_summary.rename(columns={child_level: "Category"})
     category_summary = category_summary.sort_values("Sales", ascending=True)
+    st.subheader(f"📊 {child_level}-wise Sales & Profit for {selected_month}")
 
     # 🔹 Add GP% and Market Share %
     category_summary["GP%"] = (category_summary["Profit"] / category_summary["Sales"] * 100).round(2)
@@ -181,7 +216,7 @@ else:
         barmode="group",
         bargap=0.3,
         xaxis=dict(title="Amount", range=[0, max_value], tickfont=dict(size=14)),
-        yaxis=dict(title="Category", tickfont=dict(size=14), automargin=True),
+        yaxis=dict(title=child_level, tickfont=dict(size=14), automargin=True),
         height=chart_height,
         template="plotly_white",
         margin=dict(l=220, r=50, t=50, b=50),
@@ -190,12 +225,16 @@ else:
     st.plotly_chart(fig_bar, use_container_width=True)
 
 # ==============================
-# Outlet-wise Sales & GP% chart when a category is selected
+# Outlet-wise Sales & GP% chart when a department or category is selected
 # ==============================
-if selected_category != "All" and selected_outlet == "All":
-    st.subheader(f"📊 Outlet-wise Sales & GP% for Category: {selected_category}")
+if node != "All" and selected_outlet == "All":
+    st.subheader(f"📊 Outlet-wise Sales & GP% for {level}: {node}")
 
-    outlet_summary = filtered_df.groupby("outlet")[["Sales", "Profit"]].sum().reset_index()
+    outlet_summary = pd.DataFrame(
+        [(outlet, *rollup.total(outlet, selected_month, level, node)) for outlet in outlets[1:]],
+        columns=["outlet", "Sales", "Profit"]
+    )
+    outlet_summary = outlet_summary[(outlet_summary["Sales"] != 0) | (outlet_summary["Profit"] != 0)]
     outlet_summary = outlet_summary.sort_values("Sales", ascending=True)
 
     # 🔹 Calculate GP% and Market Share %
@@ -248,8 +287,26 @@ if selected_category != "All" and selected_outlet == "All":
 
     st.plotly_chart(fig_outlet, use_container_width=True)
 
+# ==============================
+# Daily Trend & MTD Projection
+# ==============================
+st.markdown("### 📅 Daily Sales Trend & Month-to-Date Projection")
+# The daily store uses outlet names; this workbook uses outlet codes
+daily_outlet = HISTORY_OUTLET_CODES.get(selected_outlet)
+if selected_outlet != "All" and daily_outlet is None:
+    st.info(f"No daily sales drops for outlet {selected_outlet}.")
+else:
+    show_daily_sales(
+        load_daily_sales(daily_sales_version()),
+        outlets=[daily_outlet] if daily_outlet else None,
+        categories=[selected_category] if selected_category != "All" else None,
+        key="monthly_daily",
+    )
+
 # ==============================
 # Data Table
 # ==============================
 st.markdown("### 📋 Filtered Data")
 st.dataframe(filtered_df, use_container_width=True)
+download_buttons(filtered_df, "monthly_sales", key="filtered_export",
+                 group_col="outlet", sales_col="Sales", profit_col="Profit")
@@ -1,31 +1,19 @@
 import streamlit as st
 import pandas as pd
-import os
+
+from daily_sales import daily_sales_version, load_daily_sales, show_daily_sales
+from export import download_buttons
+from outlet_data import (
+    ALL, CURRENT_MONTH, CURRENT_PERIOD_DAYS, CURRENT_MONTH_DAYS,
+    load_outlet_sales, validate_outlet_sales, save_quality_report, load_history, build_variance_table,
+    add_rankings, top_n, ItemOutletMatrix
+)
 
 # ===============================
 # CONFIGURATION
 # ===============================
 st.set_page_config(page_title="Sales & Profit Dashboard", layout="wide")
 
-OUTLET_FILES = {
-    "Hilal": "Hilal oct.Xlsx",
-    "Safa Super": "Safa super oct.Xlsx",
-    "Azhar HP": "azhar HP oct.Xlsx",
-    "Azhar": "azhar Oct.Xlsx",
-    "Blue Pearl": "blue pearl oct.Xlsx",
-    "Fida": "fida oct.Xlsx",
-    "Hadeqat": "hadeqat oct.Xlsx",
-    "Jais": "jais oct.Xlsx",
-    "Sabah": "sabah oct.Xlsx",
-    "Sahat": "sahat oct.Xlsx",
-    "Shams salem": "shams salem oct.Xlsx",
-    "Shams Liwan": "liwan oct.Xlsx",
-    "Superstore": "superstore oct.Xlsx",
-    "Tay Tay": "tay tay oct.Xlsx",
-    "Safa oudmehta": "oudmehta oct.Xlsx",
-    "Port saeed": "Port saeed oct.Xlsx"
-}
-
 # ===============================
 # PASSWORD PROTECTION
 # ===============================
@@ -47,29 +35,39 @@ if not st.session_state.authenticated:
 # LOAD ALL DATA
 # ===============================
 @st.cache_data
-def load_all_outlet_data():
-    all_data = []
-    for outlet, file in OUTLET_FILES.items():
-        if os.path.exists(file):
-            df = pd.read_excel(file)
-            df["Outlet"] = outlet
-            all_data.append(df)
-        else:
-            st.warning(f"⚠️ File not found: {file}")
-    return pd.concat(all_data, ignore_index=True) if all_data else pd.DataFrame()
+def load_dashboard_data():
+    raw_df, missing = load_outlet_sales()
+    if raw_df.empty:
+        df, issues, quality_report = raw_df, pd.DataFrame(), pd.DataFrame()
+    else:
+        # Bad rows are reported and kept out of the sums once per load, not on every rerun
+        df, issues, quality_report = validate_outlet_sales(raw_df)
+        save_quality_report(quality_report, issues)
+    # Rank columns and the Margin % ordering are computed once here, not on every rerun
+    df = add_rankings(df) if not df.empty else df
+    history = load_history()
+    # Month-over-month comparison is precomputed once per load; the view below only looks rows up
+    variance = build_variance_table(df, history)
+    return df, missing, variance, quality_report, issues
 
-df = load_all_outlet_data()
+@st.cache_resource
+def load_item_matrix():
+    # Shared across sessions; built from the cached frame once per load
+    return ItemOutletMatrix(load_dashboard_data()[0])
 
-# Remove items without category
-df = df[df["Category"].notna()]
+df, missing_files, variance_df, quality_report, quality_issues = load_dashboard_data()
+for file in missing_files:
+    st.warning(f"⚠️ File not found: {file}")
 
-# Ensure numeric
-for col in ["Total Sales", "Total Profit"]:
-    if col in df.columns:
-        df[col] = pd.to_numeric(df[col], errors="coerce").fillna(0)
-
-# Compute margin %
-df["Margin %"] = (df["Total Profit"] / df["Total Sales"] * 100).fillna(0).round(2)
+if not quality_issues.empty:
+    excluded_rows = int(quality_report["Excluded Rows"].sum())
+    with st.expander(f"🧪 Data Quality: {len(quality_issues):,} flagged rows, {excluded_rows:,} excluded from totals"):
+        st.dataframe(quality_report, use_container_width=True, hide_index=True)
+        st.dataframe(
+            quality_issues[["Outlet", "Category", "Item Code", "Items", "Total Sales", "Total Profit", "Issues", "Excluded"]],
+            use_container_width=True, hide_index=True, height=300
+        )
+        download_buttons(quality_issues, "quality_issues", key="quality_export")
 
 # ===============================
 # SIDEBAR FILTERS
@@ -164,12 +162,43 @@ st.subheader("📋 Item-wise Sales, Profit & Margin")
 
 if not filtered_df.empty:
     st.dataframe(
+        # filtered_df keeps the load-time Margin % order, so no sort is needed here
         filtered_df[["Outlet", "Category","Item Code", "Items", "Total Sales", "Total Profit", "Margin %"]]
-        .sort_values(by="Margin %", ascending=True)
         .reset_index(drop=True),
         use_container_width=True,
         height=450
     )
+    download_buttons(
+        filtered_df[["Outlet", "Category", "Item Code", "Items", "Total Sales", "Total Profit", "Margin %"]],
+        "item_sales", key="items_export"
+    )
+
+# ===============================
+# LEADERBOARDS
+# ===============================
+st.subheader("🏆 Leaderboards")
+
+if not filtered_df.empty:
+    leaderboard_size = st.number_input("Rows per leaderboard", min_value=10, max_value=500, value=50, step=10)
+    leaderboard_cols = ["Outlet", "Category", "Item Code", "Items", "Total Sales", "Total Profit", "Margin %",
+                        "Outlet Sales Rank", "Category Sales Rank"]
+
+    tab_top, tab_margin, tab_loss = st.tabs(
+        [f"🥇 Top {leaderboard_size} Sellers", f"🔻 Bottom {leaderboard_size} Margin", "💸 Loss-making Items"]
+    )
+    with tab_top:
+        st.dataframe(top_n(filtered_df, "Total Sales", leaderboard_size)[leaderboard_cols].reset_index(drop=True),
+                     use_container_width=True, height=400)
+    with tab_margin:
+        # Margin is only meaningful for items that actually sold
+        selling_items = filtered_df[filtered_df["Total Sales"] > 0]
+        st.dataframe(top_n(selling_items, "Margin %", leaderboard_size, largest=False)[leaderboard_cols].reset_index(drop=True),
+                     use_container_width=True, height=400)
+    with tab_loss:
+        loss_items = filtered_df[filtered_df["Total Profit"] < 0]
+        st.caption(f"{len(loss_items):,} loss-making items in the current view (largest losses first).")
+        st.dataframe(top_n(loss_items, "Total Profit", leaderboard_size, largest=False)[leaderboard_cols].reset_index(drop=True),
+                     use_container_width=True, height=400)
 
 # ===============================
 # OUTLET-WISE TOTALS
@@ -187,5 +216,93 @@ if not filtered_df.empty:
     outlet_summary = outlet_summary.sort_values("Total Sales", ascending=False)
 
     st.dataframe(outlet_summary, use_container_width=True, height=350)
+    download_buttons(outlet_summary, "outlet_summary", key="outlet_summary_export", group_col=None)
 else:
     st.info("No outlet data to display.")
+
+# ===============================
+# MONTH-OVER-MONTH VARIANCE
+# ===============================
+st.subheader(f"📉 {CURRENT_MONTH} vs Jan–Sep History (run-rate from {CURRENT_PERIOD_DAYS} of {CURRENT_MONTH_DAYS} days)")
+st.caption("Outlet/category totals only — item search and margin filters do not apply to this section.")
+
+if not variance_df.empty and (selected_outlet, selected_category) in variance_df.index:
+    selected_row = variance_df.loc[(selected_outlet, selected_category)]
+    v1, v2, v3, v4 = st.columns(4)
+    v1.metric("📅 MTD Sales", f"{selected_row['MTD Sales']:,.2f}")
+    v2.metric("🔮 Projected Month Sales", f"{selected_row['Projected Sales']:,.2f}",
+              f"{selected_row['Δ Sales vs Avg %']:+.2f}% vs avg" if pd.notna(selected_row["Δ Sales vs Avg %"]) else None)
+    v3.metric("📆 Last Month Sales", f"{selected_row['Last Month Sales']:,.2f}")
+    v4.metric("⚙️ Margin %", f"{selected_row['MTD Margin %']:.2f}%", f"{selected_row['Δ Margin pts']:+.2f} pts")
+
+    # Breakdown rows for the selection (categories of an outlet, or outlets of a category)
+    if selected_category == ALL:
+        breakdown = variance_df.loc[selected_outlet].drop(index=ALL, errors="ignore")
+        breakdown = breakdown[~breakdown.index.isin(exclude_categories)]
+    else:
+        breakdown = variance_df.xs(selected_category, level="Category").drop(index=ALL, errors="ignore")
+        if selected_outlet != ALL:
+            breakdown = breakdown.loc[[selected_outlet]]
+
+    only_flagged = st.checkbox("Show flagged rows only", value=False)
+    if only_flagged:
+        breakdown = breakdown[breakdown["Flag"] != ""]
+
+    st.dataframe(
+        breakdown[["MTD Sales", "Projected Sales", "Last Month Sales", "Avg Monthly Sales",
+                   "Δ Sales vs Last Month %", "Δ Sales vs Avg %",
+                   "MTD Margin %", "Last Month Margin %", "Δ Margin pts", "Flag"]],
+        use_container_width=True,
+        height=400
+    )
+    download_buttons(breakdown.reset_index(), "variance", key="variance_export",
+                     sales_col="MTD Sales", profit_col="MTD Profit")
+else:
+    st.info("No history available for the selected outlet/category.")
+
+# ===============================
+# DAILY TREND & MTD PROJECTION
+# ===============================
+st.subheader("📅 Daily Sales Trend & Month-to-Date Projection")
+st.caption("From the daily sales drops — item search and margin filters do not apply to this section.")
+show_daily_sales(
+    load_daily_sales(daily_sales_version()),
+    outlets=[selected_outlet] if selected_outlet != ALL else None,
+    categories=[selected_category] if selected_category != ALL else None,
+    exclude_categories=exclude_categories,
+    key="variance_daily",
+)
+
+# ===============================
+# CROSS-OUTLET ITEM COMPARISON
+# ===============================
+st.subheader("🔀 Cross-Outlet Item Comparison")
+
+if not df.empty:
+    item_matrix = load_item_matrix()
+    col_code, col_outlets, col_threshold = st.columns([2, 3, 1])
+    with col_code:
+        compare_code = st.text_input("Item Code to compare", value=search_code, placeholder="Exact item code...")
+    with col_outlets:
+        compare_outlets = st.multiselect("Outlets", options=item_matrix.outlets)
+    with col_threshold:
+        divergence_pts = st.number_input("Highlight margin gap (pts)", min_value=0.0, value=5.0, step=1.0)
+
+    if compare_code:
+        item_row = item_matrix.row(compare_code, compare_outlets)
+        if item_row.empty:
+            st.info("Item code not found in the selected outlets.")
+        else:
+            st.markdown(f"**{item_matrix.item_name(compare_code)}** — sold in {len(item_row)} outlet(s)")
+            median_margin = item_row["Margin %"].median()
+
+            def highlight_divergent(row):
+                diverges = pd.notna(row["Margin %"]) and abs(row["Margin %"] - median_margin) >= divergence_pts
+                return ["background-color: #ffe0e0" if diverges else ""] * len(row)
+
+            st.dataframe(item_row.style.apply(highlight_divergent, axis=1).format(precision=2),
+                         use_container_width=True, hide_index=True)
+            st.caption(f"Rows highlighted where margin is {divergence_pts:g}+ pts from the item's median ({median_margin:.2f}%).")
+
+    with st.expander("📐 Items with the widest margin gap between outlets"):
+        st.dataframe(item_matrix.divergent_items(50), use_container_width=True, hide_index=True)